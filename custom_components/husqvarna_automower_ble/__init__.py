@@ -5,20 +5,38 @@ from __future__ import annotations
 import logging
 
 import asyncio
+from datetime import timedelta
 
 from automower_ble.mower import Mower
 from bleak import BleakError
-from bleak_retry_connector import close_stale_connections_by_address, get_device
 
-from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
 #from homeassistant.const import CONF_ADDRESS, CONF_CLIENT_ID, Platform
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import DOMAIN, CONF_ADDRESS, CONF_PIN, CONF_CLIENT_ID, STARTUP_MESSAGE
-from .coordinator import HusqvarnaCoordinator
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    CONF_ADDRESS,
+    CONF_PIN,
+    CONF_CLIENT_ID,
+    CONF_BACKGROUND_SETUP,
+    CONF_CONNECTION_MODE,
+    CONF_GATT_MODEL,
+    CONF_IDLE_TIMEOUT,
+    CONF_RECORD_TRACE,
+    CONNECTION_MODE_KEEP,
+    DEFAULT_IDLE_TIMEOUT,
+    MODEL,
+    SERIAL,
+    STARTUP_MESSAGE,
+)
+from .coordinator import STORAGE_VERSION, HusqvarnaCoordinator, storage_key
+from .scheduler import async_get_scheduler
+from .session import KEEPALIVE_INTERVAL, MowerConnectionError, MowerSession
+from .trace import TraceRecorder, trace_path
 
 LOGGER = logging.getLogger(__name__)
 
@@ -40,24 +58,57 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     else:
         mower = await asyncio.to_thread(Mower, channel_id, address)
 
-    await close_stale_connections_by_address(address)
-
-    LOGGER.debug("connecting to %s with channel ID %s and pin %s", address, str(channel_id), str(pin))
-    device = bluetooth.async_ble_device_from_address(
-        hass, address, connectable=True
-    ) or await get_device(address)
-    try:
-        if not await mower.connect(device):
-            raise ConfigEntryNotReady("Couldn't find device")
-    except (BleakError, TimeoutError) as ex:
-        raise ConfigEntryNotReady("Couldn't find device") from ex
-        return
-
-    LOGGER.debug("connected and paired")
-
-    model = await mower.get_model()
-    serial = await mower.command("GetSerialNumber")
-    LOGGER.info("Connected to Automower: %s", model)
+    connection_mode = entry.options.get(CONF_CONNECTION_MODE, CONNECTION_MODE_KEEP)
+    keep = connection_mode == CONNECTION_MODE_KEEP
+    session = MowerSession(
+        hass,
+        mower,
+        address,
+        keepalive_interval=KEEPALIVE_INTERVAL if keep else None,
+        # Connections opened for commands are released when idle, too
+        idle_timeout=None if keep else timedelta(
+            seconds=entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+        ),
+        scheduler=async_get_scheduler(hass),
+    )
+    if entry.options.get(CONF_RECORD_TRACE, False):
+        session.trace = TraceRecorder(
+            hass,
+            trace_path(hass, address),
+            {
+                "address": address,
+                "model": entry.data.get(MODEL),
+                "serial": entry.data.get(SERIAL),
+                "options": dict(entry.options),
+            },
+        )
+        LOGGER.info("Recording a trace of %s to %s", address, session.trace.path)
+        session.trace.wrap(mower)
+        entry.async_on_unload(session.trace.async_flush)
+
+    model = entry.data.get(MODEL)
+    serial = entry.data.get(SERIAL)
+    identity_cached = model is not None and serial is not None
+    # Without a cached identity there is nothing to register the device with yet
+    background = identity_cached and entry.options.get(CONF_BACKGROUND_SETUP, True)
+
+    if not background:
+        LOGGER.debug("connecting to %s with channel ID %s and pin %s", address, str(channel_id), str(pin))
+        try:
+            await session.async_connect()
+        except MowerConnectionError as ex:
+            raise ConfigEntryNotReady("Couldn't find device") from ex
+
+    if not identity_cached:
+        try:
+            model, serial = await _async_read_identity(session)
+        except (BleakError, TimeoutError, MowerConnectionError) as ex:
+            await session.async_close()
+            raise ConfigEntryNotReady("Couldn't read mower details") from ex
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, MODEL: model, SERIAL: serial}
+        )
+    LOGGER.info("Setting up Automower: %s", model)
 
 #    device_info = DeviceInfo(
 #        identifiers={(DOMAIN, str(address) + str(channel_id))},
@@ -66,11 +117,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 #    )
 
     #coordinator = HusqvarnaCoordinator(hass, mower, device_info, address, model)
-    coordinator = HusqvarnaCoordinator(hass, mower, address, model, channel_id, serial)
-
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = HusqvarnaCoordinator(
+        hass,
+        session,
+        address,
+        model,
+        channel_id,
+        serial,
+        entry.options,
+        model_id=entry.data.get(CONF_GATT_MODEL),
+    )
+
+    entry.async_on_unload(coordinator.presence.async_start())
+
+    restored = await coordinator.async_restore_cache()
+    if background:
+        # Entities come up now and become available once the mower answers
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_background_first_refresh(),
+            f"{DOMAIN} first refresh {address}",
+        )
+    elif restored:
+        # Show the cached values now, the first live poll runs in the background
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {address}"
+        )
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady:
+            await session.async_close()
+            raise
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    if identity_cached:
+        _async_verify_identity_later(hass, entry, coordinator)
 
 #    LOGGER.debug("now trying to add extra sensors")
 #    for platform in ["sensor"]:
@@ -81,10 +165,75 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_read_identity(session: MowerSession) -> tuple[str, str]:
+    """Read the model and serial number from the mower."""
+    async with session.connection() as mower:
+        model = await mower.get_model()
+        serial = await mower.command("GetSerialNumber")
+    return model, serial
+
+
+@callback
+def _async_verify_identity_later(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: HusqvarnaCoordinator
+) -> None:
+    """Re-read the cached identity once the mower answered a live poll.
+
+    Setup doesn't wait for it, and the connection of the poll is reused
+    while it is kept open.
+    """
+    started = False
+
+    @callback
+    def _async_polled() -> None:
+        nonlocal started
+        if started or not coordinator.last_update_success or coordinator.data_is_restored:
+            return
+        started = True
+        entry.async_create_background_task(
+            hass,
+            _async_verify_identity(hass, entry, coordinator.session),
+            f"{DOMAIN} verify identity {coordinator.address}",
+        )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_polled))
+    # The first poll may already have run during setup
+    _async_polled()
+
+
+async def _async_verify_identity(
+    hass: HomeAssistant, entry: ConfigEntry, session: MowerSession
+) -> None:
+    """Re-read the cached model and serial number and store them if they changed."""
+    try:
+        model, serial = await _async_read_identity(session)
+    except (BleakError, TimeoutError, MowerConnectionError) as ex:
+        LOGGER.debug("Couldn't verify mower details: %s", ex)
+        return
+
+    if model != entry.data.get(MODEL) or serial != entry.data.get(SERIAL):
+        LOGGER.info("Mower details changed to %s %s, reloading", model, serial)
+        # Updating the entry reloads it through the update listener
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, MODEL: model, SERIAL: serial}
+        )
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached data of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry.data[CONF_ADDRESS])).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         coordinator: HusqvarnaCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
         await coordinator.async_shutdown()
+        async_get_scheduler(hass).async_forget(coordinator.address)
 
     return unload_ok
@@ -0,0 +1,73 @@
+"""Exponential backoff between reconnect attempts."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import random
+import time
+from typing import Any
+
+RECONNECT_DELAY_MIN = timedelta(seconds=30)
+RECONNECT_DELAY_MAX = timedelta(minutes=30)
+RECONNECT_FACTOR = 2.0
+# Each delay is spread by up to this fraction either way
+RECONNECT_JITTER = 0.2
+
+
+class ReconnectBackoff:
+    """Decide when the next background connect attempt may run.
+
+    Every failed attempt doubles the wait, up to a ceiling, and randomises it
+    a little so several unreachable mowers don't retry in lockstep. A
+    successful connect resets it.
+    """
+
+    def __init__(
+        self,
+        delay_min: timedelta = RECONNECT_DELAY_MIN,
+        delay_max: timedelta = RECONNECT_DELAY_MAX,
+        factor: float = RECONNECT_FACTOR,
+        jitter: float = RECONNECT_JITTER,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initialize the backoff."""
+        self.delay_min = delay_min.total_seconds()
+        self.delay_max = delay_max.total_seconds()
+        self.factor = factor
+        self.jitter = jitter
+        self._random = rng or random.Random()
+        self.failures = 0
+        self.delay = 0.0
+        self._retry_at = 0.0
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds left before the next attempt is allowed."""
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def ready(self) -> bool:
+        """Return if a connect attempt may run now."""
+        return self.retry_in == 0.0
+
+    def record_failure(self) -> None:
+        """Push the next attempt further out after a failed connect."""
+        self.failures += 1
+        base = min(
+            self.delay_min * self.factor ** (self.failures - 1), self.delay_max
+        )
+        self.delay = base * self._random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._retry_at = time.monotonic() + self.delay
+
+    def reset(self) -> None:
+        """Allow the next attempt straight away."""
+        self.failures = 0
+        self.delay = 0.0
+        self._retry_at = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the backoff state for diagnostics."""
+        return {
+            "failures": self.failures,
+            "delay_s": round(self.delay, 1),
+            "retry_in_s": round(self.retry_in, 1),
+        }
@@ -0,0 +1,188 @@
+"""Queue of lawn mower actions for a single Husqvarna Automower."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import contextlib
+from dataclasses import dataclass, field
+from enum import StrEnum
+import logging
+
+from bleak import BleakError
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .scheduler import Priority
+from .session import MowerConnectionError, MowerSession
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MowerAction(StrEnum):
+    """Actions that can be sent to the mower."""
+
+    START = "start"
+    DOCK = "dock"
+    PAUSE = "pause"
+
+
+# Mower methods sent for each action, mower_override only when leaving the dock
+ACTION_METHODS: dict[MowerAction, tuple[str, ...]] = {
+    MowerAction.START: ("mower_resume", "mower_override"),
+    MowerAction.DOCK: ("mower_park",),
+    MowerAction.PAUSE: ("mower_pause",),
+}
+
+# What the entity shows straight away while an action is being confirmed
+OPTIMISTIC_ACTIVITY: dict[MowerAction, LawnMowerActivity] = {
+    MowerAction.START: LawnMowerActivity.MOWING,
+    MowerAction.DOCK: LawnMowerActivity.RETURNING,
+    MowerAction.PAUSE: LawnMowerActivity.PAUSED,
+}
+
+# Activities that show the mower has acted on a command
+EXPECTED_ACTIVITIES: dict[MowerAction, frozenset[LawnMowerActivity]] = {
+    MowerAction.START: frozenset({LawnMowerActivity.MOWING}),
+    MowerAction.DOCK: frozenset(
+        {LawnMowerActivity.RETURNING, LawnMowerActivity.DOCKED}
+    ),
+    MowerAction.PAUSE: frozenset({LawnMowerActivity.PAUSED}),
+}
+
+
+@dataclass
+class _PendingAction:
+    """An action waiting to be sent and everyone waiting on it."""
+
+    action: MowerAction
+    override: bool = False
+    waiters: list[asyncio.Future[None]] = field(default_factory=list)
+
+
+def _resolve(pending: _PendingAction, error: Exception | None = None) -> None:
+    """Answer everyone waiting on an action that hasn't been answered yet."""
+    for waiter in pending.waiters:
+        if waiter.done():
+            continue
+        if error is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(error)
+
+
+class MowerCommandQueue:
+    """Send lawn mower actions one at a time.
+
+    Start, dock and pause all set where the mower should go next, so an
+    action still waiting to be sent is replaced by a newer one and only the
+    last of a burst reaches the mower. A single worker drains the queue, which
+    keeps at most one action in flight, and once the queue is empty the last
+    action is confirmed rather than refreshing after every action.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: MowerSession,
+        async_confirm: Callable[[MowerAction], Awaitable[bool]],
+    ) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self.session = session
+        self._async_confirm = async_confirm
+        self._pending: _PendingAction | None = None
+        self._worker: asyncio.Task[None] | None = None
+
+    async def async_submit(self, action: MowerAction, override: bool = False) -> None:
+        """Queue an action and wait until it, or what replaced it, was sent."""
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        if self.session.trace is not None:
+            self.session.trace.mark("action", action=action, override=override)
+
+        if self._pending is None:
+            self._pending = _PendingAction(action, override)
+        else:
+            _LOGGER.debug(
+                "%s replaces queued %s for %s",
+                action,
+                self._pending.action,
+                self.session.address,
+            )
+            self._pending.action = action
+            self._pending.override = override
+        self._pending.waiters.append(future)
+
+        if self._worker is None:
+            self._worker = self.hass.async_create_background_task(
+                self._async_drain(),
+                f"husqvarna_automower_ble commands {self.session.address}",
+            )
+
+        await future
+
+    async def _async_drain(self) -> None:
+        """Send queued actions until there are none left.
+
+        Every waiter gets an answer, whatever goes wrong while sending.
+        """
+        pending: _PendingAction | None = None
+        sent = False
+        try:
+            while (pending := self._pending) is not None:
+                self._pending = None
+                sent = False
+                try:
+                    await self._async_send(pending)
+                except HomeAssistantError as ex:
+                    _resolve(pending, ex)
+                    continue
+                except Exception as ex:  # noqa: BLE001
+                    _LOGGER.exception("Unexpected error sending %s", pending.action)
+                    _resolve(
+                        pending,
+                        HomeAssistantError(f"Unable to {pending.action} the mower: {ex}"),
+                    )
+                    continue
+
+                sent = True
+                if self._pending is None:
+                    try:
+                        await self._async_confirm(pending.action)
+                    except Exception:  # noqa: BLE001
+                        # The action was sent, only its confirmation failed
+                        _LOGGER.exception("Failed to confirm %s", pending.action)
+                _resolve(pending)
+        finally:
+            self._worker = None
+            # Only left over when the worker was cancelled
+            if pending is not None and sent:
+                _resolve(pending)
+            for left in (pending, self._pending):
+                if left is not None:
+                    _resolve(left, HomeAssistantError("The mower command was not sent"))
+
+    async def async_shutdown(self) -> None:
+        """Stop sending and confirming actions, answering everyone waiting."""
+        if (worker := self._worker) is None:
+            return
+        worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await worker
+
+    async def _async_send(self, pending: _PendingAction) -> None:
+        """Send a single action to the mower."""
+        _LOGGER.debug("Sending %s to %s", pending.action, self.session.address)
+        try:
+            async with self.session.connection(Priority.USER) as mower:
+                for method in ACTION_METHODS[pending.action]:
+                    if method == "mower_override" and not pending.override:
+                        continue
+                    with self.session.metrics.measure(method):
+                        await getattr(mower, method)()
+        except (MowerConnectionError, BleakError, TimeoutError) as ex:
+            raise HomeAssistantError(
+                f"Unable to {pending.action} the mower: {ex}"
+            ) from ex
@@ -13,12 +13,41 @@ import voluptuous as vol
 
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth import BluetoothServiceInfo
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
 #from homeassistant.const import CONF_ADDRESS, CONF_CLIENT_ID
 from homeassistant.data_entry_flow import AbortFlow
+from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig
 from bleak import BleakError
 
-from .const import DOMAIN,CONF_ADDRESS,CONF_PIN,CONF_CLIENT_ID
+from .const import (
+    DOMAIN,
+    CONF_ADDRESS,
+    CONF_PIN,
+    CONF_CLIENT_ID,
+    CONF_DEVICE_TYPE,
+    CONF_GATT_MODEL,
+    CONF_MANUFACTURER,
+    CONF_INTERVAL_ACTIVE,
+    CONF_INTERVAL_IDLE,
+    CONF_INTERVAL_FROST,
+    CONF_BACKGROUND_SETUP,
+    CONF_CONNECTION_MODE,
+    CONF_IDLE_TIMEOUT,
+    CONF_RECORD_TRACE,
+    CONNECTION_MODE_AFTER_POLL,
+    CONNECTION_MODE_IDLE,
+    CONNECTION_MODE_KEEP,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_INTERVAL_ACTIVE,
+    DEFAULT_INTERVAL_IDLE,
+    DEFAULT_INTERVAL_FROST,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,6 +74,12 @@ class HusqvarnaAutomowerBleConfigFlow(ConfigFlow, domain=DOMAIN):
         self.address: str | None
         _LOGGER.debug("init - config_flow")
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Create the options flow."""
+        return HusqvarnaAutomowerBleOptionsFlow()
+
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfo
     ) -> ConfigFlowResult:
@@ -89,7 +124,14 @@ class HusqvarnaAutomowerBleConfigFlow(ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             return self.async_create_entry(
                 title=title,
-                data={CONF_ADDRESS: self.address, CONF_CLIENT_ID: channel_id, CONF_PIN: self.pin},
+                data={
+                    CONF_ADDRESS: self.address,
+                    CONF_CLIENT_ID: channel_id,
+                    CONF_PIN: self.pin,
+                    CONF_MANUFACTURER: manufacture,
+                    CONF_DEVICE_TYPE: device_type.replace("\x00", ""),
+                    CONF_GATT_MODEL: model,
+                },
             )
 
         self._set_confirm_only()
@@ -125,3 +167,59 @@ class HusqvarnaAutomowerBleConfigFlow(ConfigFlow, domain=DOMAIN):
             errors=errors
         )
 
+
+class HusqvarnaAutomowerBleOptionsFlow(OptionsFlow):
+    """Handle options for Husqvarna Bluetooth."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the poll interval and connection options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_INTERVAL_ACTIVE,
+                        default=options.get(CONF_INTERVAL_ACTIVE, DEFAULT_INTERVAL_ACTIVE),
+                    ): vol.All(int, vol.Range(min=10)),
+                    vol.Optional(
+                        CONF_INTERVAL_IDLE,
+                        default=options.get(CONF_INTERVAL_IDLE, DEFAULT_INTERVAL_IDLE),
+                    ): vol.All(int, vol.Range(min=10)),
+                    vol.Optional(
+                        CONF_INTERVAL_FROST,
+                        default=options.get(CONF_INTERVAL_FROST, DEFAULT_INTERVAL_FROST),
+                    ): vol.All(int, vol.Range(min=10)),
+                    vol.Optional(
+                        CONF_BACKGROUND_SETUP,
+                        default=options.get(CONF_BACKGROUND_SETUP, True),
+                    ): bool,
+                    vol.Optional(
+                        CONF_CONNECTION_MODE,
+                        default=options.get(CONF_CONNECTION_MODE, CONNECTION_MODE_KEEP),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[
+                                CONNECTION_MODE_KEEP,
+                                CONNECTION_MODE_IDLE,
+                                CONNECTION_MODE_AFTER_POLL,
+                            ],
+                            translation_key=CONF_CONNECTION_MODE,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_IDLE_TIMEOUT,
+                        default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+                    ): vol.All(int, vol.Range(min=5)),
+                    vol.Optional(
+                        CONF_RECORD_TRACE,
+                        default=options.get(CONF_RECORD_TRACE, False),
+                    ): bool,
+                },
+            ),
+        )
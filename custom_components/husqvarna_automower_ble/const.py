@@ -5,9 +5,32 @@ DOMAIN = "husqvarna_automower_ble"
 MANUFACTURER = "Husqvarna"
 SERIAL = "serialNumber"
 MODEL = "model"
+EVENT_DATA_CHANGED = f"{DOMAIN}_data_changed"
+EVENT_MESSAGE = f"{DOMAIN}_message"
 CONF_ADDRESS = "address"
 CONF_PIN = "pin"
 CONF_CLIENT_ID = "client_id"
+# GATT identity found by the config flow's probe
+CONF_MANUFACTURER = "manufacturer"
+CONF_DEVICE_TYPE = "device_type"
+CONF_GATT_MODEL = "gatt_model"
+CONF_INTERVAL_ACTIVE = "interval_active"
+CONF_INTERVAL_IDLE = "interval_idle"
+CONF_INTERVAL_FROST = "interval_frost"
+CONF_BACKGROUND_SETUP = "background_setup"
+CONF_CONNECTION_MODE = "connection_mode"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_RECORD_TRACE = "record_trace"
+# What happens to the connection between polls
+CONNECTION_MODE_KEEP = "keep"
+CONNECTION_MODE_IDLE = "idle"
+CONNECTION_MODE_AFTER_POLL = "after_poll"
+DEFAULT_IDLE_TIMEOUT = 60
+# Poll intervals in seconds, see HusqvarnaCoordinator._poll_interval
+DEFAULT_INTERVAL_ACTIVE = 20
+DEFAULT_INTERVAL_IDLE = 600
+DEFAULT_INTERVAL_FROST = 1800
+FROST_PROTECTION_ERROR = 62
 STARTUP_MESSAGE = f"""
 -------------------------------------------------------------------
 {NAME}
@@ -2,40 +2,200 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import timedelta, datetime
 import logging
+import asyncio
+from collections.abc import Iterable, Mapping, Sequence
 from typing import Any
 
-from automower_ble.mower import Mower
 from bleak import BleakError
-from bleak_retry_connector import close_stale_connections_by_address
 
-from homeassistant.components import bluetooth
-from homeassistant.core import HomeAssistant
+from homeassistant.components.lawn_mower import LawnMowerActivity
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.device_registry import DeviceInfo, format_mac
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
     UpdateFailed,
 )
-
-from .const import DOMAIN
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_CONNECTION_MODE,
+    CONF_INTERVAL_ACTIVE,
+    CONF_INTERVAL_FROST,
+    CONF_INTERVAL_IDLE,
+    CONNECTION_MODE_AFTER_POLL,
+    DEFAULT_INTERVAL_ACTIVE,
+    DEFAULT_INTERVAL_FROST,
+    DEFAULT_INTERVAL_IDLE,
+    DOMAIN,
+    ERROR_CODE_DESCRIPTIONS,
+    EVENT_DATA_CHANGED,
+    EVENT_MESSAGE,
+    FROST_PROTECTION_ERROR,
+    MANUFACTURER,
+)
+from .command_queue import EXPECTED_ACTIVITIES, MowerAction, MowerCommandQueue
+from .messages import MessageLog
+from .models import (
+    DATA_KEYS,
+    STATISTICS_KEYS,
+    MowerActivity,
+    MowerData,
+    MowerState,
+    MowerStatistics,
+)
+from .notifications import MowerNotifications
+from .pipeline import CommandPipeline
+from .presence import MowerPresence
+from .response_cache import MISS, ResponseCache, command_ttl
+from .scheduler import Priority
+from .session import MowerConnectionError, MowerSession
+from .usage import UsageAggregator
 
 _LOGGER = logging.getLogger(__name__)
 
 SCAN_INTERVAL = timedelta(seconds=60)
+STORAGE_VERSION = 2
+# Last known good data is written to disk at most this often
+CACHE_SAVE_DELAY = 300
+# Retry delays of the first connect when setting up in the background
+BACKGROUND_RETRY_MIN = timedelta(seconds=10)
+BACKGROUND_RETRY_MAX = timedelta(minutes=5)
+# Failed first polls before a repair issue tells the user the mower is unreachable
+BACKGROUND_ISSUE_AFTER = 3
+# Counters and the message queue change rarely, no need to read them every poll
+SLOW_POLL_INTERVAL = timedelta(minutes=15)
+SCHEDULE_POLL_INTERVAL = timedelta(minutes=5)
+# Last known good values are served for this long when the mower can't be read
+LAST_DATA_MAX_AGE = timedelta(hours=1)
+# Time budget of the commands of one poll, once connected
+POLL_DEADLINE = timedelta(seconds=30)
+# Read after the mower pushes an event, events say something happened but
+# not what, and a burst of them is read once per cooldown
+EVENT_REFRESH_KEYS = ("state", "activity", "error_code")
+EVENT_REFRESH_COOLDOWN = 1.0
+# Polls stretch to this while the mower has been pushing events recently
+NOTIFIED_POLL_INTERVAL = timedelta(minutes=10)
+NOTIFIED_MAX_AGE = timedelta(hours=1)
+
+
+@dataclass(frozen=True)
+class PollCommand:
+    """A value read from the mower and how often it is refreshed."""
+
+    key: str
+    command: str
+    params: tuple[tuple[str, Any], ...] = ()
+    interval: timedelta = timedelta(0)
+
+
+# An interval of zero means the value is read on every poll
+POLL_COMMANDS: tuple[PollCommand, ...] = (
+    PollCommand("battery_level", command="GetBatteryLevel"),
+    PollCommand("activity", command="GetActivity"),
+    PollCommand("state", command="GetState"),
+    PollCommand(
+        "next_start_time",
+        command="GetNextStartTime",
+        interval=SCHEDULE_POLL_INTERVAL,
+    ),
+    PollCommand("error_code", command="GetError"),
+    PollCommand(
+        "number_of_messages",
+        command="GetNumberOfMessages",
+        interval=SLOW_POLL_INTERVAL,
+    ),
+    PollCommand("remaining_charging_time", command="GetRemainingChargingTime"),
+    PollCommand(
+        "statistics", command="GetAllStatistics", interval=SLOW_POLL_INTERVAL
+    ),
+    PollCommand(
+        "operator_logged_in",
+        command="IsOperatorLoggedIn",
+        interval=SLOW_POLL_INTERVAL,
+    ),
+)
+
+
+def storage_key(address: str) -> str:
+    """Return the storage key of a mower's cached data."""
+    return f"{DOMAIN}.{format_mac(address).replace(':', '')}"
+
+
+class MowerDataStore(Store[dict[str, Any]]):
+    """Storage of the last known good data."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Drop caches written before the data was typed, the next poll refills it."""
+        return {}
+
+
+POLL_COMMANDS_BY_KEY = {poll.key: poll for poll in POLL_COMMANDS}
+
+# Short burst of state-only reads used to confirm a command
+CONFIRM_KEYS = ("state", "activity")
+CONFIRM_ATTEMPTS = 5
+CONFIRM_DELAY = timedelta(seconds=2)
+
+
+def _with_counters(keys: Iterable[str]) -> set[str]:
+    """Add the statistics counters to keys that include the statistics."""
+    keys = set(keys)
+    if "statistics" in keys:
+        keys.update(STATISTICS_KEYS)
+    return keys
+
+
+def get_lawn_mower_activity(data: MowerData | None) -> LawnMowerActivity | None:
+    """Map the mower state and activity to a lawn mower activity."""
+    if data is None:
+        return None
 
+    _LOGGER.debug("mower state = %s, activity = %s", data.state, data.activity)
 
-class HusqvarnaCoordinator(DataUpdateCoordinator[dict[str, bytes]]):
+    match data.state:
+        case MowerState.PAUSED:
+            return LawnMowerActivity.PAUSED
+        case MowerState.STOPPED | MowerState.OFF | MowerState.WAIT_FOR_SAFETYPIN:
+            return LawnMowerActivity.ERROR
+        case (
+            MowerState.RESTRICTED
+            | MowerState.IN_OPERATION
+            | MowerState.PENDING_START
+        ):
+            match data.activity:
+                case MowerActivity.CHARGING | MowerActivity.PARKED:
+                    return LawnMowerActivity.DOCKED
+                case MowerActivity.GOING_OUT | MowerActivity.MOWING:
+                    return LawnMowerActivity.MOWING
+                case MowerActivity.GOING_HOME:
+                    return LawnMowerActivity.RETURNING
+                case MowerActivity.STOPPED_IN_GARDEN:
+                    return LawnMowerActivity.ERROR
+    return LawnMowerActivity.ERROR
+
+
+class HusqvarnaCoordinator(DataUpdateCoordinator[MowerData]):
     """Class to manage fetching data."""
 
     def __init__(
         self,
         hass: HomeAssistant,
-        mower: Mower,
+        session: MowerSession,
         address: str,
         model: str,
         channel_id: str,
         serial: str,
+        options: Mapping[str, Any] | None = None,
+        model_id: str | None = None,
     ) -> None:
         """Initialize global data updater."""
         super().__init__(
@@ -46,114 +206,602 @@ class HusqvarnaCoordinator(DataUpdateCoordinator[dict[str, bytes]]):
         )
         self.address = address
         self.model = model
-        self.mower = mower
+        self.session = session
+        self.mower = session.mower
+        self.metrics = session.metrics
+        self.pipeline = CommandPipeline(session.mower)
+        if session.trace is not None:
+            session.trace.wrap_pipeline(self.pipeline)
+        self.response_cache = ResponseCache()
+        self.command_queue = MowerCommandQueue(
+            hass, session, self.async_confirm_action
+        )
         self.channel_id = channel_id
         self.serial = serial
+        # Shared by all entities so the device is registered the same way
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, serial)},
+            manufacturer=MANUFACTURER,
+            model=model,
+            model_id=model_id,
+        )
         self._last_successful_update = None
-        self._last_data = None
+        self._last_data: MowerData | None = None
+        self._next_poll: dict[str, datetime] = {}
+        self._store = MowerDataStore(hass, STORAGE_VERSION, storage_key(address))
+        # Set while the data comes from the cache rather than a live poll
+        self.data_is_restored = False
+        # What listeners were last told about, to work out what changed
+        self._notified_data: MowerData | None = None
+        self._notified_success = True
+        self._notified_restored = False
+        self._notified_stale: frozenset[str] = frozenset()
+        # Keys the last poll was due to read but didn't get
+        self._missed_keys: set[str] = set()
+        self.changed_keys: frozenset[str] = frozenset()
+        self.message_log = MessageLog()
+        self.usage = UsageAggregator()
+        self.presence = MowerPresence(hass, address, self._async_mower_reappeared)
+        self.notifications = MowerNotifications(session.mower, self._async_mower_event)
+        self.notifications.start()
+        self._event_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=EVENT_REFRESH_COOLDOWN,
+            immediate=True,
+            function=self._async_refresh_on_event,
+        )
+        # Set while polls are skipped because the mower isn't advertising
+        self._skipped_absent = False
+        # Repair issue raised while the first poll in the background keeps failing
+        self._issue_id = f"cannot_connect_{format_mac(address).replace(':', '')}"
+        options = options or {}
+        self._release_after_poll = (
+            options.get(CONF_CONNECTION_MODE) == CONNECTION_MODE_AFTER_POLL
+        )
+        self._interval_active = timedelta(
+            seconds=options.get(CONF_INTERVAL_ACTIVE, DEFAULT_INTERVAL_ACTIVE)
+        )
+        self._interval_idle = timedelta(
+            seconds=options.get(CONF_INTERVAL_IDLE, DEFAULT_INTERVAL_IDLE)
+        )
+        self._interval_frost = timedelta(
+            seconds=options.get(CONF_INTERVAL_FROST, DEFAULT_INTERVAL_FROST)
+        )
+
+    async def async_restore_cache(self) -> bool:
+        """Load the last known good data saved before the last shutdown."""
+        if not (cached := await self._store.async_load()):
+            return False
+        if messages := cached.get("messages"):
+            self.message_log = MessageLog.from_dict(messages)
+        if usage := cached.get("usage"):
+            self.usage = UsageAggregator.from_dict(usage)
+        if not cached.get("data"):
+            return False
+
+        _LOGGER.debug("Restored data from %s", cached["updated"])
+        self._last_data = MowerData.from_dict(cached["data"])
+        if cached.get("updated"):
+            self._last_successful_update = datetime.fromisoformat(cached["updated"])
+        self.data = self._last_data
+        self.data_is_restored = True
+        return True
+
+    async def async_background_first_refresh(self) -> None:
+        """Keep trying the first poll until it succeeds.
+
+        Scheduled polls are paused meanwhile so the mower isn't polled twice,
+        the first successful poll sets the interval again. A repair issue is
+        raised while the mower keeps failing to answer.
+        """
+        self.update_interval = None
+        delay = BACKGROUND_RETRY_MIN
+        attempts = 0
+        try:
+            while True:
+                await self.async_refresh()
+                if self.last_update_success and not self.data_is_restored:
+                    _LOGGER.debug("First poll of %s succeeded", self.address)
+                    ir.async_delete_issue(self.hass, DOMAIN, self._issue_id)
+                    return
+                attempts += 1
+                if attempts == BACKGROUND_ISSUE_AFTER:
+                    _LOGGER.warning(
+                        "Can't reach %s, still retrying in the background", self.address
+                    )
+                    ir.async_create_issue(
+                        self.hass,
+                        DOMAIN,
+                        self._issue_id,
+                        is_fixable=False,
+                        severity=ir.IssueSeverity.WARNING,
+                        translation_key="cannot_connect",
+                        translation_placeholders={"address": self.address},
+                    )
+                _LOGGER.debug(
+                    "First poll of %s failed, retrying in %s", self.address, delay
+                )
+                await asyncio.sleep(delay.total_seconds())
+                delay = min(delay * 2, BACKGROUND_RETRY_MAX)
+        finally:
+            if self.update_interval is None:
+                self.update_interval = SCAN_INTERVAL
+
+    @callback
+    def _cache_data(self) -> dict[str, Any]:
+        """Return the data to write to the cache."""
+        return {
+            "updated": (
+                self._last_successful_update.isoformat()
+                if self._last_successful_update is not None
+                else None
+            ),
+            "data": self._last_data.as_dict(),
+            "messages": self.message_log.as_dict(),
+            "usage": self.usage.as_dict(),
+        }
+
+    @callback
+    def _async_save_cache(self) -> None:
+        """Schedule writing the last known good data to disk."""
+        self._store.async_delay_save(self._cache_data, CACHE_SAVE_DELAY)
+
+    async def async_confirm_action(self, action: MowerAction) -> bool:
+        """Poll state and activity until the mower shows it acted on a command."""
+        expected = EXPECTED_ACTIVITIES[action]
+        for attempt in range(CONFIRM_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(CONFIRM_DELAY.total_seconds())
+            try:
+                data = await self.async_refresh_keys(CONFIRM_KEYS)
+            except UpdateFailed as ex:
+                _LOGGER.debug("Failed to confirm %s: %s", action, ex)
+                break
+
+            activity = get_lawn_mower_activity(data)
+            if activity in expected:
+                _LOGGER.debug("Mower confirmed %s, now %s", action, activity)
+                return True
+
+        _LOGGER.debug("Mower did not confirm %s, refreshing", action)
+        await self.async_request_refresh()
+        return False
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose keys changed.
+
+        Listeners registered with a set of keys as context, which is what
+        the entities do, are skipped when none of their keys changed. Keys
+        that failed to be read or just went stale count as changed too, so
+        their entities turn unavailable. Everyone is notified when the update
+        failed or the data stopped being restored.
+        """
+        changed = self.data.diff(self._notified_data) if self.data else set()
+        stale = self._stale_keys()
+        notify = changed | _with_counters(
+            self._missed_keys | (stale ^ self._notified_stale)
+        )
+        self._missed_keys = set()
+        self._notified_stale = stale
+        notify_all = (
+            not self.last_update_success
+            or self.last_update_success != self._notified_success
+            or self.data_is_restored != self._notified_restored
+        )
+        self._notified_data = self.data
+        self._notified_success = self.last_update_success
+        self._notified_restored = self.data_is_restored
+        self.changed_keys = frozenset(changed)
+
+        if changed:
+            _LOGGER.debug("Changed keys: %s", sorted(changed))
+            self.hass.bus.async_fire(
+                EVENT_DATA_CHANGED,
+                {"address": self.address, "changed_keys": sorted(changed)},
+            )
+
+        for update_callback, context in list(self._listeners.values()):
+            if (
+                notify_all
+                or not isinstance(context, frozenset)
+                or context & notify
+            ):
+                update_callback()
+
+    async def async_refresh_keys(
+        self, keys: Iterable[str], priority: Priority = Priority.USER
+    ) -> MowerData:
+        """Read only the given keys from the mower.
+
+        coordinator.data is updated in place and only listeners of keys that
+        changed are notified, the regular poll schedule is left alone.
+        """
+        keys = list(keys)
+        if unknown := set(keys) - POLL_COMMANDS_BY_KEY.keys():
+            raise ValueError(f"Unknown keys: {', '.join(sorted(unknown))}")
+        try:
+            return await self._async_poll_keys(keys, priority)
+        except (TimeoutError, BleakError, MowerConnectionError) as ex:
+            raise UpdateFailed(f"Error reading {', '.join(keys)}: {ex}") from ex
+
+    async def _async_poll_keys(
+        self, keys: Iterable[str], priority: Priority = Priority.USER
+    ) -> MowerData:
+        """Read only the given keys and merge them into the current data."""
+        keys = list(keys)
+        now = datetime.now()
+        polls = [POLL_COMMANDS_BY_KEY[key] for key in keys]
+        async with self.session.connection(priority):
+            values = await self._async_fetch_all(polls)
+        # Merge into the data as it is now, a poll may have finished meanwhile
+        data = self._last_data.copy() if self._last_data else MowerData()
+        for key, value in values.items():
+            data.set(key, value, now)
+            _LOGGER.debug("%s: %s", key, getattr(data, key))
+        for poll in polls:
+            self._next_poll[poll.key] = now + poll.interval
+
+        self._invalidate_responses(self._last_data, data)
+        self._last_data = data
+        self.data = data
+        self.update_interval = self._poll_interval(data)
+        self._async_save_cache()
+        self.async_update_listeners()
+        return data
+
+    def _poll_interval(self, data: MowerData) -> timedelta:
+        """Pick the next poll interval.
+
+        While the connection is kept and the mower pushes events, changes are
+        read as they happen and polls are only a safety net.
+        """
+        interval = self._state_poll_interval(data)
+        if (
+            not self._release_after_poll
+            and self.session.is_connected()
+            and self.notifications.seen_since(datetime.now() - NOTIFIED_MAX_AGE)
+        ):
+            return max(interval, NOTIFIED_POLL_INTERVAL)
+        return interval
+
+    def _state_poll_interval(self, data: MowerData) -> timedelta:
+        """Pick the next poll interval from the last known mower state."""
+        if data.error_code == FROST_PROTECTION_ERROR:
+            return self._interval_frost
+
+        match get_lawn_mower_activity(data):
+            case (
+                LawnMowerActivity.MOWING
+                | LawnMowerActivity.RETURNING
+                | LawnMowerActivity.ERROR
+            ):
+                return self._interval_active
+            case LawnMowerActivity.DOCKED if data.battery_level == 100:
+                return self._interval_idle
+        return SCAN_INTERVAL
+
+    @callback
+    def _async_mower_reappeared(self) -> None:
+        """Poll straight away when the mower comes back in range.
+
+        A mower stops advertising while connected, so it also comes back
+        after every release of the connection. Only polls that were skipped
+        or failed are made up for.
+        """
+        self.session.backoff.reset()
+        if not self._skipped_absent and self.last_update_success:
+            return
+        self.hass.async_create_background_task(
+            self.async_request_refresh(), f"{DOMAIN} reappeared {self.address}"
+        )
+
+    @callback
+    def _async_mower_event(self, frame: bytes) -> None:
+        """Read the state straight away when the mower pushes an event."""
+        if self.session.trace is not None:
+            self.session.trace.mark("event", frame=frame)
+        self._event_debouncer.async_schedule_call()
+
+    async def _async_refresh_on_event(self) -> None:
+        """Read the values an event may have changed."""
+        try:
+            await self.async_refresh_keys(EVENT_REFRESH_KEYS, Priority.POLL)
+        except UpdateFailed as ex:
+            _LOGGER.debug("Failed to read state after event: %s", ex)
+
+    def _has_recent_data(self) -> bool:
+        """Return if the last known good values are still worth showing."""
+        return (
+            self._last_data is not None
+            and self._last_successful_update is not None
+            and datetime.now() - self._last_successful_update < LAST_DATA_MAX_AGE
+        )
 
     async def async_shutdown(self) -> None:
         """Shutdown coordinator and any connection."""
         _LOGGER.debug("Shutdown")
+        self._event_debouncer.async_cancel()
+        # An action still being confirmed would reconnect through the closed session
+        await self.command_queue.async_shutdown()
+        ir.async_delete_issue(self.hass, DOMAIN, self._issue_id)
         await super().async_shutdown()
-        if self.mower.is_connected():
-            await self.mower.disconnect()
+        # Keys read since a restore count, even before a complete poll
+        if self._last_data:
+            await self._store.async_save(self._cache_data())
+        await self.session.async_close()
 
     async def _async_find_device(self):
         _LOGGER.debug("Trying to reconnect")
-        await close_stale_connections_by_address(self.address)
+        try:
+            await self.session.async_connect()
+        except MowerConnectionError as ex:
+            raise UpdateFailed(str(ex)) from ex
+
+    async def _async_fetch(
+        self, poll: PollCommand, deadline: float | None = None
+    ) -> Any:
+        """Send a single poll command to the mower.
+
+        The deadline is applied inside the measurement, so a command cut off
+        by it is counted as a timeout rather than going unrecorded.
+        """
+        try:
+            with self.metrics.measure(poll.command):
+                async with asyncio.timeout_at(deadline):
+                    return await self.mower.command(poll.command, **dict(poll.params))
+        except ValueError as e:
+            # workaround for issue21
+            if poll.command == "GetAllStatistics" and "Data length mismatch" in str(e):
+                _LOGGER.debug("Known fail on GetAllStatistics - skipping")
+                return None
+            raise  # Re-raise the exception if it's not the known ValueError
 
-        _LOGGER.debug("bluetooth connect...")
-        device = bluetooth.async_ble_device_from_address(
-            self.hass, self.address, connectable=True
+    async def _async_fetch_all(
+        self,
+        polls: Sequence[PollCommand],
+        values: dict[str, Any] | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        """Send poll commands, pipelined where possible, and return their values.
+
+        Responses that are still fresh in the response cache aren't sent.
+        Values are added to the given dict as they arrive, so they survive a
+        command failing halfway, and once the loop time passes the deadline
+        the remaining commands are left out.
+        """
+        if values is None:
+            values = {}
+        for poll in polls:
+            ttl = command_ttl(poll.command, self._last_data)
+            if ttl and (
+                response := self.response_cache.get(poll.command, poll.params, ttl)
+            ) is not MISS:
+                values[poll.key] = response
+        to_send = [poll for poll in polls if poll.key not in values]
+
+        if self.pipeline.enabled:
+            remaining = iter(to_send)
+            for batch in self.pipeline.batches(
+                [(poll.command, dict(poll.params)) for poll in to_send]
+            ):
+                batch_polls = [next(remaining) for _ in batch]
+                if not self.pipeline.enabled or self._past(deadline):
+                    break
+                with self.metrics.measure("pipeline"):
+                    async with asyncio.timeout_at(deadline):
+                        responses = await self.pipeline.async_run(batch)
+                for poll in batch_polls:
+                    if poll.command in responses:
+                        values[poll.key] = responses[poll.command]
+
+        # Whatever couldn't be pipelined goes one command at a time
+        for poll in to_send:
+            if poll.key not in values:
+                if self._past(deadline):
+                    _LOGGER.debug("Poll deadline passed, skipping %s", poll.key)
+                    continue
+                values[poll.key] = await self._async_fetch(poll, deadline)
+            if values[poll.key] is not None:
+                self.response_cache.put(poll.command, poll.params, values[poll.key])
+        return {poll.key: values[poll.key] for poll in polls if poll.key in values}
+
+    def _past(self, deadline: float | None) -> bool:
+        """Return if a poll with a deadline should stop sending commands.
+
+        That is once the loop time passed it, or a user action of another
+        mower waits for the adapter slot.
+        """
+        return deadline is not None and (
+            self.hass.loop.time() >= deadline or self.session.yield_requested
         )
-        _LOGGER.debug("back from async_ble_device_from_address")
-        if not device:
-            _LOGGER.debug("Can't find device")
-            raise UpdateFailed("Can't find device")
 
-        try:
-            if not await self.mower.connect(device):
-                _LOGGER.debug("failed to connect in self.mower.connect")
-                raise UpdateFailed("Failed to connect")
-        except (TimeoutError, BleakError) as ex:
-            _LOGGER.debug("except hit from ble connect")
-            raise UpdateFailed("Failed to connect") from ex
-
-    async def _async_update_data(self) -> dict[str, bytes]:
-        """Poll the device."""
-        _LOGGER.debug("Polling device")
+    def _stale_keys(self) -> frozenset[str]:
+        """Return the keys that weren't read recently enough to show."""
+        if self.data is None:
+            return frozenset()
+        now = datetime.now()
+        return frozenset(
+            key
+            for key in DATA_KEYS
+            if (updated := self.data.updated.get(key)) is None
+            or now - updated >= LAST_DATA_MAX_AGE
+        )
 
-        data: dict[str, bytes] = {}
+    def is_fresh(self, keys: Iterable[str]) -> bool:
+        """Return if all of the given keys were read recently enough to show."""
+        if self.data is None:
+            return False
+        now = datetime.now()
+        for key in keys:
+            # Statistics counters are read together under one key
+            updated = self.data.updated.get(
+                "statistics" if key in STATISTICS_KEYS else key
+            )
+            if updated is None or now - updated >= LAST_DATA_MAX_AGE:
+                return False
+        return True
+
+    def _invalidate_responses(self, old: MowerData | None, new: MowerData) -> None:
+        """Drop cached responses the new data shows to be out of date."""
+        if old is not None and old.activity != new.activity:
+            # Leaving the dock starts the counters, leaving charging ends it
+            self.response_cache.invalidate(
+                "GetAllStatistics", "GetRemainingChargingTime"
+            )
+
+    async def _async_fetch_message(self, message_id: int) -> dict[str, Any] | None:
+        """Read one message from the mower's message log."""
+        with self.metrics.measure("GetMessage"):
+            return await self.mower.command("GetMessage", messageId=message_id)
+
+    @callback
+    def _async_fire_message(self, message: Mapping[str, Any]) -> None:
+        """Report a message read from the mower's log."""
+        code = message.get("code")
+        self.hass.bus.async_fire(
+            EVENT_MESSAGE,
+            {
+                "address": self.address,
+                "model": self.model,
+                "time": (
+                    datetime.fromtimestamp(message["time"]).isoformat()
+                    if message.get("time") is not None
+                    else None
+                ),
+                "code": code,
+                "severity": message.get("severity"),
+                "description": ERROR_CODE_DESCRIPTIONS.get(
+                    code, f"Unknown error ({code})"
+                ),
+            },
+        )
 
-        try:
-            if not self.mower.is_connected():
-                await self._async_find_device()
-        except (TimeoutError, BleakError) as ex:
-            raise UpdateFailed("Failed to connect") from ex
+    @callback
+    def _async_add_usage(self, statistics: MowerStatistics) -> None:
+        """Derive usage from new counters and import it into the recorder."""
+        self.usage.add(statistics, dt_util.utcnow())
+        if "recorder" not in self.hass.config.components:
+            return
+        self.usage.async_import(
+            self.hass,
+            format_mac(self.address).replace(":", ""),
+            f"Automower {self.model}",
+        )
 
+    async def _async_update_data(self) -> MowerData:
+        """Poll the device."""
+        if self.session.trace is not None:
+            self.session.trace.mark("poll")
         try:
-            data["battery_level"] = await self.mower.battery_level()
-            _LOGGER.debug("battery level: " + str(data["battery_level"]))
-#            if data["battery_level"] is None:
-#                await self._async_find_device()
-#                raise UpdateFailed("Error getting data from device")
-
-            data["activity"] = await self.mower.mower_activity()
-            _LOGGER.debug("activity: " + str(data["activity"]))
-#            if data["activity"] is None:
-#                await self._async_find_device()
-#                raise UpdateFailed("Error getting data from device")
-
-            data["state"] = await self.mower.mower_state()
-            _LOGGER.debug("state: " + str(data["state"]))
-#            if data["state"] is None:
-#                await self._async_find_device()
-#                raise UpdateFailed("Error getting data from device")
-
-            data["next_start_time"] = await self.mower.mower_next_start_time()
-            _LOGGER.debug("next_start_time: " + str(data["next_start_time"]))
-#            if data["next_start_time"] is None:
-#                await self._async_find_device()
-#                raise UpdateFailed("Error getting data from device")
-
-            data["errorCode"] = await self.mower.command("GetError")
-            _LOGGER.debug("errorCode: " + str(data["errorCode"]))
-
-            data["NumberOfMessages"] = await self.mower.command("GetNumberOfMessages")
-            _LOGGER.debug("NumberOfMessages: " + str(data["NumberOfMessages"]))
-
-            data["RemainingChargingTime"] = await self.mower.command("GetRemainingChargingTime")
-            _LOGGER.debug("RemainingChargingTime: " + str(data["RemainingChargingTime"]))
+            with self.metrics.measure("poll"):
+                return await self._async_poll_due()
+        finally:
+            if self._release_after_poll:
+                # Free the adapter slot until the next poll
+                await self.session.async_disconnect()
+            if self.session.trace is not None:
+                # Calls after this, such as keepalives, aren't part of the poll
+                self.session.trace.mark("poll_done")
+
+    async def _async_poll_due(self) -> MowerData:
+        """Read the values that are due and merge them with the rest."""
+        _LOGGER.debug("Polling device")
 
-            # workaround for issue21
-            try:
-                data["statistics"] = await self.mower.command("GetAllStatistics")
-                _LOGGER.debug("statuses: " + str(data["statistics"]))
-            except ValueError as e:
-                if "Data length mismatch" in str(e):
-                    _LOGGER.debug("Known fail on GetAllStatistics - skipping")
-                    data["statistics"] = None
-                else:
-                    raise  # Re-raise the exception if it's not the known ValueError
+        if not self.session.is_connected() and not self.presence.in_range:
+            # A connect attempt would only time out and hold an adapter slot
+            _LOGGER.debug("%s is not advertising, skipping poll", self.address)
+            self._skipped_absent = True
+            if self._has_recent_data():
+                return self._last_data
+            raise UpdateFailed("Mower is out of range")
 
-            data["operatorstate"] = await self.mower.command("IsOperatorLoggedIn")
-            _LOGGER.debug("IsOperatorLoggedIn: " + str(data["operatorstate"]))
+        self._skipped_absent = False
+        if not self.session.is_connected():
+            # The operator login only lasts as long as the connection
+            self.response_cache.invalidate("IsOperatorLoggedIn")
+            await self._async_find_device()
 
-            data["last_message"] = await self.mower.command("GetMessage", messageId=0)
-            _LOGGER.debug("last_message: " + str(data["last_message"]))
+        now = datetime.now()
+        due = [
+            poll
+            for poll in POLL_COMMANDS
+            if self._next_poll.get(poll.key, datetime.min) <= now
+        ]
+        _LOGGER.debug("Commands due this cycle: %s", [poll.key for poll in due])
 
-            self._last_successful_update = datetime.now()
-            self._last_data = data
+        values: dict[str, Any] = {}
+        messages: list[dict[str, Any]] = []
 
-        except (TimeoutError, BleakError) as ex:
-            _LOGGER.error("Error getting data from device")
-            if self._last_data and (datetime.now() - self._last_successful_update < timedelta(hours=1)):
-                _LOGGER.debug("Failed to fetch data, using last known good values from the past 1hr")
-                return self._last_data
-            else:
+        try:
+            async with self.session.connection():
+                deadline = self.hass.loop.time() + POLL_DEADLINE.total_seconds()
+                await self._async_fetch_all(due, values, deadline)
+
+                # Read the log when its size was just read or a backlog is left
+                count = values.get(
+                    "number_of_messages",
+                    self._last_data.number_of_messages if self._last_data else None,
+                )
+                if (
+                    count
+                    and not self._past(deadline)
+                    and (
+                        self.message_log.cursor is not None
+                        or "number_of_messages" in values
+                    )
+                ):
+                    messages = await self.message_log.async_read_new(
+                        self._async_fetch_message, count
+                    )
+
+        except (TimeoutError, BleakError, MowerConnectionError) as ex:
+            if not values:
+                _LOGGER.error("Error getting data from device")
+                if self._has_recent_data():
+                    _LOGGER.debug("Failed to fetch data, using last known good values from the past 1hr")
+                    self._missed_keys = {poll.key for poll in due}
+                    return self._last_data
                 await self._async_find_device()
                 raise UpdateFailed("Error getting data from device") from ex
+            # Keep what was read, the rest stays due for the next poll
+            _LOGGER.debug(
+                "Poll cut short after %s of %s values: %s", len(values), len(due), ex
+            )
+
+        # Start from the values as they are now, not as they were before waiting
+        # for the mower, so keys a partial refresh read meanwhile keep theirs
+        data = self._last_data.copy() if self._last_data else MowerData()
+        self._missed_keys = {poll.key for poll in due if poll.key not in values}
+        for poll in due:
+            if poll.key not in values:
+                continue
+            data.set(poll.key, values[poll.key], now)
+            _LOGGER.debug("%s: %s", poll.key, getattr(data, poll.key))
+            self._next_poll[poll.key] = now + poll.interval
+        # A drained backlog holds older messages than the last one
+        if messages and (
+            data.last_message is None
+            or messages[-1].get("time", 0) > data.last_message.get("time", 0)
+        ):
+            data.set("last_message", messages[-1], now)
+
+        if all(poll.key in values for poll in due):
+            self._last_successful_update = datetime.now()
+            # Every key has been read live since the restore, the first poll
+            # after it has them all due
+            self.data_is_restored = False
+        # Otherwise only the keys that were read count as updated, see is_fresh
+        self._invalidate_responses(self._last_data, data)
+        self._last_data = data
+        self.update_interval = self._poll_interval(data)
+        self._async_save_cache()
+        _LOGGER.debug("Next poll in %s", self.update_interval)
+        for message in messages:
+            self._async_fire_message(message)
+        if data.statistics is not None and "statistics" in values:
+            self._async_add_usage(data.statistics)
 
         _LOGGER.debug("return from coordinator with data")
         return data
@@ -164,11 +812,31 @@ class HusqvarnaAutomowerBleEntity(CoordinatorEntity[HusqvarnaCoordinator]):
 
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator: HusqvarnaCoordinator, context: Any = None) -> None:
-        """Initialize coordinator entity."""
-        super().__init__(coordinator, context)
+    def __init__(
+        self, coordinator: HusqvarnaCoordinator, keys: Iterable[str] | None = None
+    ) -> None:
+        """Initialize coordinator entity.
+
+        With keys given the entity is only updated when one of them changes.
+        """
+        self._data_keys = None if keys is None else frozenset(keys)
+        super().__init__(coordinator, self._data_keys)
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.mower.is_connected()
+        """Return if entity is available.
+
+        The connection may be released between polls, so this follows how
+        recently the values were read rather than the link itself.
+        """
+        if self.coordinator.data_is_restored:
+            # Cached values are shown, flagged as stale, until a live poll
+            return True
+        if self._data_keys is None:
+            return self.coordinator.last_update_success
+        return self.coordinator.is_fresh(self._data_keys)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Flag values restored from the cache until a live poll succeeds."""
+        return {"stale": self.coordinator.data_is_restored}
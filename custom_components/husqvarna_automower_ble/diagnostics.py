@@ -0,0 +1,52 @@
+"""Diagnostics support for Husqvarna Automower BLE."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_CLIENT_ID, CONF_PIN, DOMAIN
+from .coordinator import HusqvarnaCoordinator
+
+TO_REDACT = {CONF_PIN, CONF_CLIENT_ID}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: HusqvarnaCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "model": coordinator.model,
+        "connected": coordinator.session.is_connected(),
+        "presence": coordinator.presence.as_dict(),
+        "reconnect_backoff": coordinator.session.backoff.as_dict(),
+        "connection": coordinator.session.connection_stats(),
+        "pipelining": coordinator.pipeline.enabled,
+        "notifications": coordinator.notifications.as_dict(),
+        "response_cache": coordinator.response_cache.as_dict(),
+        "update_interval": str(coordinator.update_interval),
+        "last_successful_update": (
+            coordinator._last_successful_update.isoformat()
+            if coordinator._last_successful_update
+            else None
+        ),
+        "data": coordinator.data.as_dict() if coordinator.data else None,
+        "changed_keys": sorted(coordinator.changed_keys),
+        "metrics": coordinator.metrics.as_dict(),
+        "usage": {
+            "rates": coordinator.usage.rates(dt_util.now().date()),
+            "days": {
+                day.isoformat(): deltas for day, deltas in coordinator.usage.days.items()
+            },
+        },
+    }
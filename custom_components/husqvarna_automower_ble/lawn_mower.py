@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.components import bluetooth
 from homeassistant.components.lawn_mower import (
     LawnMowerActivity,
     LawnMowerEntity,
@@ -12,11 +11,16 @@ from homeassistant.components.lawn_mower import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, MANUFACTURER
-from .coordinator import HusqvarnaAutomowerBleEntity, HusqvarnaCoordinator
+from .command_queue import EXPECTED_ACTIVITIES, OPTIMISTIC_ACTIVITY, MowerAction
+from .const import DOMAIN
+from .coordinator import (
+    CONFIRM_KEYS,
+    HusqvarnaAutomowerBleEntity,
+    HusqvarnaCoordinator,
+    get_lawn_mower_activity,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -58,109 +62,70 @@ class AutomowerLawnMower(HusqvarnaAutomowerBleEntity, LawnMowerEntity):
         features: LawnMowerEntityFeature = LawnMowerEntityFeature(0),
     ) -> None:
         """Initialize the lawn mower."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, CONFIRM_KEYS)
         self._attr_name = name
         self._attr_unique_id = unique_id
         self._attr_supported_features = features
         self._attr_activity = LawnMowerActivity.ERROR
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.serial)},
-            manufacturer=MANUFACTURER,
-            model=coordinator.model,
-        )
+        self._optimistic_action: MowerAction | None = None
+        self._attr_device_info = coordinator.device_info
 
     def _get_activity(self) -> LawnMowerActivity | None:
         """Return the current lawn mower activity."""
-        if self.coordinator.data is None:
-            return None
-
-        state = str(self.coordinator.data["state"])
-        activity = str(self.coordinator.data["activity"])
-
-        _LOGGER.debug("mower state = " + state)
-        _LOGGER.debug("mower activity = " + activity)
-
-        if state is None or activity is None:
-            return None
-        match state:
-            case "5":
-                return LawnMowerActivity.PAUSED
-            case "2" | "0" | "1":
-                return LawnMowerActivity.ERROR
-            case "7" | "6" | "4":
-                match activity:
-                    case "1" | "5":
-                        return LawnMowerActivity.DOCKED
-                    case "2" | "3":
-                        return LawnMowerActivity.MOWING
-                    case "4":
-                        return LawnMowerActivity.RETURNING
-                    case "6":
-                        return LawnMowerActivity.ERROR
-        return LawnMowerActivity.ERROR
+        return get_lawn_mower_activity(self.coordinator.data)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         _LOGGER.debug("AutomowerLawnMower: _handle_coordinator_update")
+        shown = (self._attr_activity, self.available, self.coordinator.data_is_restored)
         self._update_attr()
-        super()._handle_coordinator_update()
+        if shown != (self._attr_activity, self.available, self.coordinator.data_is_restored):
+            self.async_write_ha_state()
 
     @callback
     def _update_attr(self) -> None:
-        self._attr_activity = self._get_activity()
+        activity = self._get_activity()
+        if self._optimistic_action is not None:
+            if activity not in EXPECTED_ACTIVITIES[self._optimistic_action]:
+                # Keep showing the requested activity until it is confirmed
+                return
+            self._optimistic_action = None
+        self._attr_activity = activity
         self._attr_available = self._attr_activity is not None
 
+    async def _async_send(self, action: MowerAction, override: bool = False) -> None:
+        """Show the action's outcome straight away, then send and confirm it."""
+        self._optimistic_action = action
+        self._attr_activity = OPTIMISTIC_ACTIVITY[action]
+        self.async_write_ha_state()
+
+        try:
+            await self.coordinator.command_queue.async_submit(action, override)
+        finally:
+            # Confirmed or not, go back to what the mower last reported
+            if self._optimistic_action is action:
+                self._optimistic_action = None
+            self._update_attr()
+            self.async_write_ha_state()
+
     async def async_start_mowing(self) -> None:
         """Start mowing."""
         _LOGGER.debug("Starting mower")
 
-        if not self.coordinator.mower.is_connected():
-            device = bluetooth.async_ble_device_from_address(
-                self.coordinator.hass, self.coordinator.address, connectable=True
-            )
-            if not await self.coordinator.mower.connect(device):
-                return
-
-        await self.coordinator.mower.mower_resume()
-        if self._attr_activity == LawnMowerActivity.DOCKED:
-            await self.coordinator.mower.mower_override()
-        await self.coordinator.async_request_refresh()
-
-        self._attr_activity = self._get_activity()
-        self.async_write_ha_state()
+        await self._async_send(
+            MowerAction.START,
+            override=self._attr_activity == LawnMowerActivity.DOCKED,
+        )
 
     async def async_dock(self) -> None:
         """Start docking."""
         _LOGGER.debug("Start docking")
 
-        if not self.coordinator.mower.is_connected():
-            device = bluetooth.async_ble_device_from_address(
-                self.coordinator.hass, self.coordinator.address, connectable=True
-            )
-            if not await self.coordinator.mower.connect(device):
-                return
-
-        await self.coordinator.mower.mower_park()
-        await self.coordinator.async_request_refresh()
-
-        self._attr_activity = self._get_activity()
-        self.async_write_ha_state()
+        await self._async_send(MowerAction.DOCK)
 
     async def async_pause(self) -> None:
         """Pause mower."""
         _LOGGER.debug("Pausing mower")
 
-        if not self.coordinator.mower.is_connected():
-            device = bluetooth.async_ble_device_from_address(
-                self.coordinator.hass, self.coordinator.address, connectable=True
-            )
-            if not await self.coordinator.mower.connect(device):
-                return
-
-        await self.coordinator.mower.mower_pause()
-        await self.coordinator.async_request_refresh()
-
-        self._attr_activity = self._get_activity()
-        self.async_write_ha_state()
-
+        await self._async_send(MowerAction.PAUSE)
@@ -0,0 +1,35 @@
+"""Describe Husqvarna Automower BLE logbook events."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.components.logbook import (
+    LOGBOOK_ENTRY_MESSAGE,
+    LOGBOOK_ENTRY_NAME,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN, EVENT_MESSAGE
+
+
+@callback
+def async_describe_events(
+    hass: HomeAssistant,
+    async_describe_event: Callable[[str, str, Callable[[Event], dict[str, str]]], None],
+) -> None:
+    """Describe messages read from the mower's log."""
+
+    @callback
+    def async_describe_message(event: Event) -> dict[str, str]:
+        """Describe a mower message."""
+        data: dict[str, Any] = event.data
+        return {
+            LOGBOOK_ENTRY_NAME: f"Automower {data.get('model') or data['address']}",
+            LOGBOOK_ENTRY_MESSAGE: (
+                f"reported {data['description']} (code {data['code']}) at {data['time']}"
+            ),
+        }
+
+    async_describe_event(DOMAIN, EVENT_MESSAGE, async_describe_message)
@@ -0,0 +1,103 @@
+"""Incremental reading of the mower's message log."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Mapping
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Messages read per poll at most, a long backlog is drained over several polls
+MESSAGES_PER_POLL = 5
+# Keys of reported messages kept to recognise them, well above the log size
+SEEN_MAX = 500
+
+
+def message_key(message: Mapping[str, Any]) -> str:
+    """Return what identifies a message in the log."""
+    return f"{message.get('time')}:{message.get('code')}"
+
+
+class MessageLog:
+    """Remember which messages of the mower's log were already reported.
+
+    Message 0 is the newest, so new messages push the older ones to higher
+    ids. Each read starts at the top and stops at the first message already
+    reported. When the read budget runs out first, a cursor remembers where
+    to carry on and later polls drain the rest, shifting the cursor by the
+    number of messages that arrived in between.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty log."""
+        self._seen: dict[str, None] = {}
+        self.cursor: int | None = None
+
+    async def async_read_new(
+        self,
+        async_fetch: Callable[[int], Awaitable[Mapping[str, Any] | None]],
+        count: int,
+        limit: int = MESSAGES_PER_POLL,
+    ) -> list[dict[str, Any]]:
+        """Read messages not reported before, returned oldest first.
+
+        Nothing is marked as reported unless the whole read succeeds, so
+        messages from a failed read are returned again next time.
+        """
+        new: dict[str, dict[str, Any]] = {}
+        budget = limit
+
+        message_id = 0
+        reached_seen = False
+        while budget and message_id < count:
+            message = await async_fetch(message_id)
+            budget -= 1
+            if not message:
+                break
+            key = message_key(message)
+            if key in self._seen:
+                reached_seen = True
+                break
+            new[key] = dict(message)
+            message_id += 1
+
+        if not reached_seen:
+            # Budget or log ran out above anything reported before
+            cursor: int | None = message_id if message_id < count else None
+        elif self.cursor is not None:
+            cursor = self.cursor + message_id
+            while budget and cursor < count:
+                message = await async_fetch(cursor)
+                budget -= 1
+                if not message:
+                    break
+                cursor += 1
+                if (key := message_key(message)) not in self._seen:
+                    new[key] = dict(message)
+            if cursor >= count:
+                cursor = None
+        else:
+            cursor = None
+
+        self.cursor = cursor
+        for key in new:
+            self._seen[key] = None
+        while len(self._seen) > SEEN_MAX:
+            del self._seen[next(iter(self._seen))]
+
+        if self.cursor is not None:
+            _LOGGER.debug("Message log read up to %s of %s", self.cursor, count)
+        return sorted(new.values(), key=lambda message: message.get("time") or 0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {"seen": list(self._seen), "cursor": self.cursor}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> MessageLog:
+        """Restore the state persisted by as_dict."""
+        log = cls()
+        log._seen = dict.fromkeys(data.get("seen", ()))
+        log.cursor = data.get("cursor")
+        return log
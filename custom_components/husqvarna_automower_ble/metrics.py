@@ -0,0 +1,117 @@
+"""Latency and failure counters for mower commands."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+import time
+from typing import Any
+
+# Upper bounds in milliseconds of the latency histogram buckets
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+RECENT_SAMPLES = 20
+
+
+class CommandStats:
+    """Counters and latency histogram for one command."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.success = 0
+        self.timeout = 0
+        self.error = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms: float | None = None
+        self.last_error: str | None = None
+        self.last_at: datetime | None = None
+        # One extra bucket for anything slower than the last bound
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    @property
+    def count(self) -> int:
+        """Return how often the command was sent."""
+        return self.success + self.timeout + self.error
+
+    def record(self, duration_ms: float, error: BaseException | None = None) -> None:
+        """Record one attempt."""
+        if error is None:
+            self.success += 1
+        elif isinstance(error, TimeoutError):
+            self.timeout += 1
+        else:
+            self.error += 1
+        if error is not None:
+            self.last_error = f"{type(error).__name__}: {error}"
+
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.last_ms = duration_ms
+        self.last_at = datetime.now()
+        self.histogram[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.recent.append(round(duration_ms, 1))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "count": self.count,
+            "success": self.success,
+            "timeout": self.timeout,
+            "error": self.error,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "max_ms": round(self.max_ms, 1),
+            "last_ms": None if self.last_ms is None else round(self.last_ms, 1),
+            "last_error": self.last_error,
+            "last_at": self.last_at.isoformat() if self.last_at else None,
+            "histogram_ms": {
+                **{
+                    f"<={bound}": count
+                    for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram)
+                },
+                f">{LATENCY_BUCKETS_MS[-1]}": self.histogram[-1],
+            },
+            "recent_ms": list(self.recent),
+        }
+
+
+class MowerMetrics:
+    """Per-mower command and connect statistics kept in memory."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.commands: dict[str, CommandStats] = {}
+
+    def get(self, name: str) -> CommandStats:
+        """Return the statistics of a command, creating them if needed."""
+        if (stats := self.commands.get(name)) is None:
+            stats = self.commands[name] = CommandStats()
+        return stats
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Time the wrapped command and count how it ended."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as ex:
+            self.get(name).record((time.perf_counter() - start) * 1000, ex)
+            raise
+        self.get(name).record((time.perf_counter() - start) * 1000)
+
+    @property
+    def failures(self) -> int:
+        """Return the number of failed commands and connects."""
+        return sum(stats.timeout + stats.error for stats in self.commands.values())
+
+    def last_ms(self, name: str) -> float | None:
+        """Return the latest duration of a command."""
+        stats = self.commands.get(name)
+        return None if stats is None else stats.last_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all statistics for diagnostics."""
+        return {name: stats.as_dict() for name, stats in sorted(self.commands.items())}
@@ -0,0 +1,207 @@
+"""Typed snapshot of the data read from a Husqvarna Automower."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timezone
+from enum import IntEnum
+import logging
+from typing import Any, TypeVar
+
+# Re-exported so the integration uses the library's enums rather than a copy
+from automower_ble.protocol import MowerActivity, MowerState
+
+from .const import ERROR_CODE_DESCRIPTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+_EnumT = TypeVar("_EnumT", bound=IntEnum)
+
+
+@dataclass(slots=True)
+class MowerStatistics:
+    """Lifetime counters returned by GetAllStatistics."""
+
+    total_running_time: int | None = None
+    total_cutting_time: int | None = None
+    total_charging_time: int | None = None
+    total_searching_time: int | None = None
+    number_of_collisions: int | None = None
+    number_of_charging_cycles: int | None = None
+    cutting_blade_usage_time: int | None = None
+
+    @classmethod
+    def from_response(cls, response: Any) -> MowerStatistics | None:
+        """Build the counters from a GetAllStatistics response."""
+        if not isinstance(response, Mapping):
+            return None
+        return cls(
+            **{
+                name: response.get(response_key)
+                for response_key, name in STATISTICS_RESPONSE_KEYS.items()
+            }
+        )
+
+    def as_dict(self) -> dict[str, int | None]:
+        """Return the counters keyed by field name."""
+        return {name: getattr(self, name) for name in STATISTICS_KEYS}
+
+
+# GetAllStatistics response key of each counter
+STATISTICS_RESPONSE_KEYS = {
+    "totalRunningTime": "total_running_time",
+    "totalCuttingTime": "total_cutting_time",
+    "totalChargingTime": "total_charging_time",
+    "totalSearchingTime": "total_searching_time",
+    "numberOfCollisions": "number_of_collisions",
+    "numberOfChargingCycles": "number_of_charging_cycles",
+    "cuttingBladeUsageTime": "cutting_blade_usage_time",
+}
+STATISTICS_KEYS = tuple(f.name for f in fields(MowerStatistics))
+
+
+def _parse_enum(enum: type[_EnumT]) -> Callable[[Any], _EnumT | None]:
+    """Return a parser turning a raw value into a member of the enum."""
+
+    def parse(value: Any) -> _EnumT | None:
+        if value is None:
+            return None
+        try:
+            return enum(int(value))
+        except (TypeError, ValueError):
+            _LOGGER.debug("Unknown %s: %s", enum.__name__, value)
+            return None
+
+    return parse
+
+
+def _parse_int(value: Any) -> int | None:
+    """Return the value as an int."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        _LOGGER.debug("Not a number: %s", value)
+        return None
+
+
+def _parse_bool(value: Any) -> bool | None:
+    """Return the value as a bool."""
+    return None if value is None else bool(value)
+
+
+def _parse_next_start_time(value: Any) -> datetime | None:
+    """Return the next start time from a timestamp or a cached ISO string."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if isinstance(value, int):
+        # Zero means nothing is scheduled
+        return datetime.fromtimestamp(value, timezone.utc) if value else None
+    return value
+
+
+def _parse_message(value: Any) -> dict[str, Any] | None:
+    """Return a copy of a message response."""
+    return dict(value) if isinstance(value, Mapping) else None
+
+
+@dataclass(slots=True)
+class MowerData:
+    """Everything read from the mower, with when each value was read."""
+
+    battery_level: int | None = None
+    activity: MowerActivity | None = None
+    state: MowerState | None = None
+    next_start_time: datetime | None = None
+    error_code: int | None = None
+    number_of_messages: int | None = None
+    remaining_charging_time: int | None = None
+    statistics: MowerStatistics | None = None
+    operator_logged_in: bool | None = None
+    last_message: dict[str, Any] | None = None
+    updated: dict[str, datetime] = field(default_factory=dict)
+
+    @property
+    def error_description(self) -> str | None:
+        """Return the description of the error code."""
+        if self.error_code is None:
+            return None
+        return ERROR_CODE_DESCRIPTIONS.get(
+            self.error_code, f"Unknown error ({self.error_code})"
+        )
+
+    def set(self, key: str, value: Any, when: datetime) -> None:
+        """Store a raw value read from the mower."""
+        setattr(self, key, PARSERS[key](value))
+        self.updated[key] = when
+
+    def copy(self) -> MowerData:
+        """Return a copy that can be changed without touching this one."""
+        return replace(self, updated=dict(self.updated))
+
+    def diff(self, other: MowerData | None) -> set[str]:
+        """Return the keys whose value differs from another snapshot.
+
+        Statistics counters are compared one by one and reported under their
+        own name, together with "statistics" itself.
+        """
+        if other is None:
+            return {*DATA_KEYS, *STATISTICS_KEYS}
+
+        changed = {
+            key for key in DATA_KEYS if getattr(self, key) != getattr(other, key)
+        }
+        if "statistics" in changed:
+            mine = self.statistics or MowerStatistics()
+            theirs = other.statistics or MowerStatistics()
+            changed.update(
+                key
+                for key in STATISTICS_KEYS
+                if getattr(mine, key) != getattr(theirs, key)
+            )
+        return changed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the data as plain JSON friendly values."""
+        data: dict[str, Any] = {key: getattr(self, key) for key in DATA_KEYS}
+        if self.statistics is not None:
+            data["statistics"] = self.statistics.as_dict()
+        if self.next_start_time is not None:
+            data["next_start_time"] = self.next_start_time.isoformat()
+        data["updated"] = {key: when.isoformat() for key, when in self.updated.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> MowerData:
+        """Build the data from the output of as_dict."""
+        mower_data = cls()
+        for key in DATA_KEYS:
+            if key == "statistics":
+                if (statistics := data.get(key)) is not None:
+                    mower_data.statistics = MowerStatistics(**statistics)
+            elif key in data:
+                setattr(mower_data, key, PARSERS[key](data[key]))
+        mower_data.updated = {
+            key: datetime.fromisoformat(when)
+            for key, when in data.get("updated", {}).items()
+        }
+        return mower_data
+
+
+DATA_KEYS = tuple(f.name for f in fields(MowerData) if f.name != "updated")
+
+# How the raw value of each key is turned into its typed form
+PARSERS: dict[str, Callable[[Any], Any]] = {
+    "battery_level": _parse_int,
+    "activity": _parse_enum(MowerActivity),
+    "state": _parse_enum(MowerState),
+    "next_start_time": _parse_next_start_time,
+    "error_code": _parse_int,
+    "number_of_messages": _parse_int,
+    "remaining_charging_time": _parse_int,
+    "statistics": MowerStatistics.from_response,
+    "operator_logged_in": _parse_bool,
+    "last_message": _parse_message,
+}
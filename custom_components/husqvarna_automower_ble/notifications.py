@@ -0,0 +1,105 @@
+"""Pick unsolicited events out of the mower's notification stream."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+import logging
+from typing import Any
+
+from automower_ble.mower import Mower
+
+_LOGGER = logging.getLogger(__name__)
+
+# Packet type byte of a frame, requests are 0x00 and responses 0x01
+PACKET_TYPE_EVENT = 0x02
+
+
+def _is_event_start(data: bytes | bytearray) -> bool:
+    """Return if a notification starts an event frame."""
+    return (
+        len(data) > 10
+        and data[0] == 0x02
+        and data[1] == 0xFD
+        and data[10] == PACKET_TYPE_EVENT
+    )
+
+
+class _NotificationQueue(asyncio.Queue):
+    """Queue of notifications that hands event frames to a callback.
+
+    The mower's notification handler puts every notification on its queue
+    and the next request flushes whatever nobody asked for, so events pushed
+    by the mower are lost. Frames marked as events are taken out here before
+    they reach the queue, and responses pass through untouched.
+    """
+
+    def __init__(self, on_frame: Callable[[bytes], None]) -> None:
+        """Initialize the queue."""
+        super().__init__()
+        self._on_frame = on_frame
+        self._event = bytearray()
+
+    def put_nowait(self, item: Any) -> None:
+        """Route event frames to the callback, queue everything else."""
+        if not isinstance(item, bytes | bytearray):
+            # Mower.disconnect() queues None to wake up a waiting reader, a
+            # half received event won't be finished after that
+            self._event.clear()
+            super().put_nowait(item)
+            return
+        if self._event:
+            # Rest of an event split over several notifications
+            self._event += item
+        elif _is_event_start(item):
+            self._event = bytearray(item)
+        else:
+            super().put_nowait(item)
+            return
+
+        if len(self._event) >= self._event[2] + 4:
+            frame = bytes(self._event)
+            self._event.clear()
+            self._on_frame(frame)
+
+
+class MowerNotifications:
+    """Listen for events the mower pushes over its notify characteristic."""
+
+    def __init__(self, mower: Mower, on_event: Callable[[bytes], None]) -> None:
+        """Initialize the listener."""
+        self.mower = mower
+        self._on_event = on_event
+        self.events = 0
+        self.last_event: datetime | None = None
+        self.supported = False
+
+    def start(self) -> None:
+        """Put the event filter in front of the mower's notification queue."""
+        queue = getattr(self.mower, "queue", None)
+        if not isinstance(queue, asyncio.Queue):
+            _LOGGER.debug("Mower client has no notification queue, not listening")
+            return
+        if not isinstance(queue, _NotificationQueue):
+            self.mower.queue = _NotificationQueue(self._handle_frame)
+        self.supported = True
+
+    def _handle_frame(self, frame: bytes) -> None:
+        """Count an event and pass it on."""
+        _LOGGER.debug("Event from mower: %s", frame.hex())
+        self.events += 1
+        self.last_event = datetime.now()
+        self._on_event(frame)
+
+    def seen_since(self, since: datetime) -> bool:
+        """Return if the mower pushed an event after the given time."""
+        return self.last_event is not None and self.last_event >= since
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the listener state for diagnostics."""
+        return {
+            "supported": self.supported,
+            "events": self.events,
+            "last_event": self.last_event.isoformat() if self.last_event else None,
+        }
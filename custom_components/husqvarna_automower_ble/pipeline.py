@@ -0,0 +1,135 @@
+"""Send several protocol commands to the mower without waiting in between."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping, Sequence
+import logging
+from typing import Any
+
+from automower_ble.mower import Mower
+from automower_ble.protocol import Command
+
+_LOGGER = logging.getLogger(__name__)
+
+# Requests in flight at once, the mower only buffers a few
+PIPELINE_DEPTH = 4
+# Seconds to wait for each response before giving up on the rest
+RESPONSE_TIMEOUT = 5.0
+
+# BLEClient internals the pipeline writes and reads through
+_REQUIRED_ATTRIBUTES = ("_write_data", "queue", "protocol", "channel_id")
+
+
+def _response_id(response: bytes | bytearray) -> tuple[int, int]:
+    """Return the module and command a response belongs to."""
+    return int.from_bytes(response[12:14], "little"), response[14]
+
+
+class CommandPipeline:
+    """Write requests back to back and match the responses to them.
+
+    The protocol has no request ids, but every response repeats the module
+    and command it answers, so a batch can hold each command at most once.
+    Commands whose response doesn't come back or can't be parsed are left to
+    the caller to send on their own. After a batch loses a response or gets
+    one it didn't ask for, the pipeline turns itself off and everything is
+    sent one at a time, since some firmware may not cope with queued
+    requests. A response that can't be parsed says nothing about that.
+    """
+
+    def __init__(self, mower: Mower) -> None:
+        """Initialize the pipeline."""
+        self.mower = mower
+        self.enabled = all(hasattr(mower, attr) for attr in _REQUIRED_ATTRIBUTES)
+        self._buffer = bytearray()
+
+    def batches(
+        self, commands: Sequence[tuple[str, Mapping[str, Any]]]
+    ) -> list[list[tuple[str, Mapping[str, Any]]]]:
+        """Split commands into batches that can each be pipelined."""
+        batches: list[list[tuple[str, Mapping[str, Any]]]] = []
+        current: list[tuple[str, Mapping[str, Any]]] = []
+        for command in commands:
+            if len(current) == PIPELINE_DEPTH or any(
+                name == command[0] for name, _ in current
+            ):
+                batches.append(current)
+                current = []
+            current.append(command)
+        if current:
+            batches.append(current)
+        return batches
+
+    async def async_run(
+        self, batch: Sequence[tuple[str, Mapping[str, Any]]]
+    ) -> dict[str, Any]:
+        """Send a batch and return the parsed response of each command.
+
+        Commands missing from the result got no usable response.
+        """
+        commands = {
+            name: Command(self.mower.channel_id, self.mower.protocol[name])
+            for name, _ in batch
+        }
+        by_id = {
+            (command.major, command.minor): name for name, command in commands.items()
+        }
+
+        # Drop anything left over from earlier requests
+        while not self.mower.queue.empty():
+            self.mower.queue.get_nowait()
+        self._buffer.clear()
+
+        for name, params in batch:
+            await self.mower._write_data(commands[name].generate_request(**params))  # noqa: SLF001
+
+        results: dict[str, Any] = {}
+        answered = 0
+        for _ in batch:
+            if (response := await self._async_read_response()) is None:
+                break
+            if (name := by_id.get(_response_id(response))) is None:
+                _LOGGER.debug("Unexpected response %s", response.hex())
+                continue
+            answered += 1
+            try:
+                results[name] = self._parse(commands[name], response)
+            except ValueError as ex:
+                # Only this command failed, it is sent again on its own
+                _LOGGER.debug("Couldn't parse response to %s: %s", name, ex)
+
+        if answered < len(batch):
+            _LOGGER.debug(
+                "Pipelined batch got %s of %s responses, sending one at a time from now on",
+                answered,
+                len(batch),
+            )
+            self.enabled = False
+        return results
+
+    async def _async_read_response(self) -> bytes | None:
+        """Collect notifications until they hold a whole response."""
+        try:
+            while len(self._buffer) < 3 or len(self._buffer) < self._buffer[2] + 4:
+                self._buffer += await asyncio.wait_for(
+                    self.mower.queue.get(), RESPONSE_TIMEOUT
+                )
+        except TimeoutError:
+            return None
+
+        length = self._buffer[2] + 4
+        response = bytes(self._buffer[:length])
+        # A notification may already hold the start of the next response
+        del self._buffer[:length]
+        return response
+
+    @staticmethod
+    def _parse(command: Command, response: bytes) -> Any:
+        """Parse a response the way Mower.command does."""
+        if command.validate_response(response) is False:
+            _LOGGER.debug("Response failed validation")
+        parsed = command.parse_response(response)
+        if parsed is not None and len(parsed) == 1:
+            return parsed["response"]
+        return parsed
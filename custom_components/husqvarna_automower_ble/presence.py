@@ -0,0 +1,109 @@
+"""Track whether a Husqvarna Automower is in range from its advertisements."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.components import bluetooth
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MowerPresence:
+    """Passively follow the advertisements of one mower.
+
+    Home Assistant already scans for the mower, so listening costs nothing on
+    the air. The mower counts as in range from its last advertisement until
+    Home Assistant's Bluetooth stack declares it unavailable.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        on_reappear: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.address = address
+        self._on_reappear = on_reappear
+        self.in_range = False
+        self.last_seen: datetime | None = None
+        self.rssi: int | None = None
+        self.source: str | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start listening, return a function that stops it."""
+        self.in_range = bluetooth.async_address_present(
+            self.hass, self.address, connectable=True
+        )
+        if service_info := bluetooth.async_last_service_info(
+            self.hass, self.address, connectable=True
+        ):
+            self._record(service_info)
+
+        unsub_advertisement = bluetooth.async_register_callback(
+            self.hass,
+            self._async_advertisement,
+            bluetooth.BluetoothCallbackMatcher(address=self.address, connectable=True),
+            bluetooth.BluetoothScanningMode.PASSIVE,
+        )
+        unsub_unavailable = bluetooth.async_track_unavailable(
+            self.hass, self._async_unavailable, self.address, connectable=True
+        )
+
+        @callback
+        def _async_stop() -> None:
+            unsub_advertisement()
+            unsub_unavailable()
+
+        return _async_stop
+
+    def _record(self, service_info: bluetooth.BluetoothServiceInfoBleak) -> None:
+        """Remember where and how well the mower was last heard."""
+        self.last_seen = datetime.now()
+        self.rssi = service_info.rssi
+        self.source = service_info.source
+
+    @callback
+    def _async_advertisement(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        """Record an advertisement and report the mower coming back."""
+        self._record(service_info)
+        if self.in_range:
+            return
+
+        _LOGGER.debug(
+            "%s is back in range of %s (RSSI %s)",
+            self.address,
+            self.source,
+            self.rssi,
+        )
+        self.in_range = True
+        if self._on_reappear is not None:
+            self._on_reappear()
+
+    @callback
+    def _async_unavailable(
+        self, service_info: bluetooth.BluetoothServiceInfoBleak
+    ) -> None:
+        """Mark the mower out of range once it stopped advertising."""
+        _LOGGER.debug("%s is out of range", self.address)
+        self.in_range = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return what was last heard for diagnostics."""
+        return {
+            "in_range": self.in_range,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "rssi": self.rssi,
+            "source": self.source,
+        }
@@ -0,0 +1,77 @@
+"""Cache of mower responses that rarely change."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Hashable
+from datetime import timedelta
+import time
+from typing import Any, Final
+
+from .models import MowerActivity, MowerData
+
+# Returned by ResponseCache.get when there is no fresh entry
+MISS: Final = object()
+
+DOCKED_ACTIVITIES = (MowerActivity.CHARGING, MowerActivity.PARKED)
+
+# How long responses are trusted, entries are also dropped on reconnect or
+# when the activity changes, see HusqvarnaCoordinator
+STATISTICS_TTL_DOCKED = timedelta(hours=1)
+REMAINING_CHARGING_TIME_TTL = timedelta(hours=6)
+OPERATOR_TTL = timedelta(hours=1)
+
+
+def command_ttl(command: str, data: MowerData | None) -> timedelta:
+    """Return how long a response stays valid given the last known data."""
+    activity = data.activity if data is not None else None
+    match command:
+        case "IsOperatorLoggedIn":
+            return OPERATOR_TTL
+        case "GetAllStatistics" if activity in DOCKED_ACTIVITIES:
+            # Nothing is cut or collided with in the dock
+            return STATISTICS_TTL_DOCKED
+        case "GetRemainingChargingTime" if (
+            activity is not None and activity != MowerActivity.CHARGING
+        ):
+            return REMAINING_CHARGING_TIME_TTL
+    return timedelta(0)
+
+
+class ResponseCache:
+    """Responses keyed by command and parameters, each with a time to live.
+
+    Only consulted for commands with a time to live, so the hit and miss
+    counts show how well the cacheable commands are served.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: dict[tuple[str, Hashable], tuple[Any, float]] = {}
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def get(self, command: str, params: Hashable, ttl: timedelta) -> Any:
+        """Return the cached response, or MISS when there is none young enough."""
+        entry = self._entries.get((command, params))
+        if entry is not None and time.monotonic() - entry[1] < ttl.total_seconds():
+            self.hits[command] += 1
+            return entry[0]
+        self.misses[command] += 1
+        return MISS
+
+    def put(self, command: str, params: Hashable, response: Any) -> None:
+        """Remember a response read from the mower."""
+        self._entries[(command, params)] = (response, time.monotonic())
+
+    def invalidate(self, *commands: str) -> None:
+        """Forget every response of the given commands."""
+        for key in [key for key in self._entries if key[0] in commands]:
+            del self._entries[key]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the hit and miss counts for diagnostics."""
+        return {
+            command: {"hits": self.hits[command], "misses": self.misses[command]}
+            for command in sorted(self.hits.keys() | self.misses.keys())
+        }
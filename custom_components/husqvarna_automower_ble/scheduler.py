@@ -0,0 +1,218 @@
+"""Share Bluetooth adapters fairly between Husqvarna Automowers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from enum import IntEnum
+import heapq
+import itertools
+import logging
+import time
+
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+# Most adapters and ESPHome proxies only manage a handful of connections
+MAX_CONNECTIONS_PER_ADAPTER = 2
+# Minimum gap between two background polls starting on the same adapter
+POLL_SPACING = 2.0
+
+UNKNOWN_ADAPTER = "unknown"
+
+
+class Priority(IntEnum):
+    """Order in which waiting mowers get an adapter slot."""
+
+    USER = 0
+    POLL = 1
+
+
+class _AdapterSlots:
+    """Connection slots of a single adapter."""
+
+    def __init__(self, max_connections: int) -> None:
+        """Initialize the slots."""
+        self.max_connections = max_connections
+        self.active = 0
+        self.last_poll = 0.0
+        self._waiters: list[tuple[int, float, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+
+    async def acquire(self, priority: Priority, last_served: float) -> None:
+        """Wait for a free slot.
+
+        Waiters are served by priority first, then the mower that has gone
+        longest without a slot goes next.
+        """
+        if self.active < self.max_connections and not self._waiters:
+            self.active += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (priority, last_served, next(self._counter), future)
+        )
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Free a slot and hand it to the next waiter."""
+        self.active -= 1
+        while self._waiters and self.active < self.max_connections:
+            *_, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of callers waiting for a slot."""
+        return sum(not future.done() for *_, future in self._waiters)
+
+
+class PriorityLock:
+    """Lock that goes to waiting user actions before waiting polls.
+
+    Waiters of the same priority are served in the order they came.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the lock."""
+        self._slots = _AdapterSlots(1)
+
+    def locked(self) -> bool:
+        """Return if the lock is held."""
+        return self._slots.active > 0
+
+    @asynccontextmanager
+    async def hold(self, priority: Priority = Priority.POLL) -> AsyncIterator[None]:
+        """Hold the lock."""
+        await self._slots.acquire(priority, 0.0)
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+
+class AdapterScheduler:
+    """Limit and order mower connections per Bluetooth adapter.
+
+    A mower holds one of its adapter's slots from connecting until it
+    disconnects, so the limit is on open connections. When a mower has to
+    wait, the holders on its adapter are told through the callback they
+    acquired with, and are expected to let go of their connection as soon as
+    they are idle, see contended.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_connections: int = MAX_CONNECTIONS_PER_ADAPTER,
+        poll_spacing: float = POLL_SPACING,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.max_connections = max_connections
+        self.poll_spacing = poll_spacing
+        self._adapters: dict[str, _AdapterSlots] = {}
+        self._last_served: dict[str, float] = {}
+        # Slots held by connected mowers, by address
+        self._held: dict[str, _AdapterSlots] = {}
+        # Called with the priority of a mower that has to wait for a slot
+        self._on_contended: dict[str, Callable[[Priority], None]] = {}
+
+    @callback
+    def adapter_for(self, address: str) -> str:
+        """Return the adapter that last heard the mower."""
+        service_info = bluetooth.async_last_service_info(
+            self.hass, address, connectable=True
+        )
+        return service_info.source if service_info else UNKNOWN_ADAPTER
+
+    async def async_acquire(
+        self,
+        address: str,
+        priority: Priority = Priority.POLL,
+        on_contended: Callable[[Priority], None] | None = None,
+    ) -> None:
+        """Wait for a connection slot on the mower's adapter and hold it.
+
+        While the slot is held, on_contended is called whenever another mower
+        has to wait for a slot on the same adapter.
+        """
+        if address in self._held:
+            return
+        adapter = self.adapter_for(address)
+        slots = self._adapters.get(adapter)
+        if slots is None:
+            slots = self._adapters[adapter] = _AdapterSlots(self.max_connections)
+
+        if priority is Priority.POLL:
+            # Spread background polls out instead of starting them together
+            delay = slots.last_poll + self.poll_spacing - time.monotonic()
+            slots.last_poll = max(slots.last_poll + self.poll_spacing, time.monotonic())
+            if delay > 0:
+                _LOGGER.debug("Delaying poll of %s on %s by %.1fs", address, adapter, delay)
+                await asyncio.sleep(delay)
+
+        if slots.active >= slots.max_connections or slots.waiting:
+            self._ask_to_yield(slots, priority)
+        await slots.acquire(priority, self._last_served.get(address, 0.0))
+        self._held[address] = slots
+        if on_contended is not None:
+            self._on_contended[address] = on_contended
+        _LOGGER.debug(
+            "%s got a slot on %s (%s active, %s waiting)",
+            address,
+            adapter,
+            slots.active,
+            slots.waiting,
+        )
+
+    @callback
+    def _ask_to_yield(self, slots: _AdapterSlots, priority: Priority) -> None:
+        """Tell the mowers holding the adapter's slots that someone waits."""
+        for address, held in list(self._held.items()):
+            if held is slots and (on_contended := self._on_contended.get(address)):
+                on_contended(priority)
+
+    @callback
+    def release(self, address: str) -> None:
+        """Give back the slot a mower held, once it disconnected."""
+        self._on_contended.pop(address, None)
+        if (slots := self._held.pop(address, None)) is not None:
+            self._last_served[address] = time.monotonic()
+            slots.release()
+
+    @callback
+    def contended(self, address: str) -> bool:
+        """Return if other mowers wait for the slot this mower holds."""
+        slots = self._held.get(address)
+        return slots is not None and slots.waiting > 0
+
+    @callback
+    def async_forget(self, address: str) -> None:
+        """Drop fairness history for a mower that is no longer set up."""
+        self.release(address)
+        self._last_served.pop(address, None)
+
+
+@callback
+@singleton(DATA_SCHEDULER)
+def async_get_scheduler(hass: HomeAssistant) -> AdapterScheduler:
+    """Return the scheduler shared by all mowers."""
+    return AdapterScheduler(hass)
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -15,17 +18,35 @@ from homeassistant.const import PERCENTAGE,UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import EntityCategory
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import format_mac
-from datetime import datetime, timedelta
 
-from .const import DOMAIN, MANUFACTURER, ERROR_CODE_DESCRIPTIONS
-from .coordinator import HusqvarnaCoordinator
+from .const import DOMAIN
+from .coordinator import HusqvarnaAutomowerBleEntity, HusqvarnaCoordinator
+from .models import MowerData
 
 _LOGGER = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True, kw_only=True)
+class AutomowerSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor showing a value read from the mower."""
+
+    value_fn: Callable[[MowerData], Any]
+    # Coordinator keys the value depends on
+    data_keys: tuple[str, ...]
+
+
+def _statistic(name: str) -> Callable[[MowerData], int | None]:
+    """Return a function reading one of the lifetime counters."""
+
+    def value(data: MowerData) -> int | None:
+        return None if data.statistics is None else getattr(data.statistics, name)
+
+    return value
+
+
 MOWER_SENSORS = [
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Battery Level",
         key="battery_level",
         unit_of_measurement=PERCENTAGE,
@@ -33,8 +54,10 @@ MOWER_SENSORS = [
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=None,
         icon="mdi:battery",
+        value_fn=lambda data: data.battery_level,
+        data_keys=("battery_level",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Next Start Time",
         key="next_start_time",
         unit_of_measurement=None,
@@ -42,8 +65,10 @@ MOWER_SENSORS = [
         state_class=None,
         entity_category=None,
         icon="mdi:timer",
+        value_fn=lambda data: data.next_start_time,
+        data_keys=("next_start_time",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Total running time",
         key="totalRunningTime",
         unit_of_measurement=UnitOfTime.SECONDS,
@@ -51,8 +76,10 @@ MOWER_SENSORS = [
         state_class=SensorStateClass.TOTAL,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:timer",
+        value_fn=_statistic("total_running_time"),
+        data_keys=("total_running_time",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Total cutting time",
         key="totalCuttingTime",
         unit_of_measurement=UnitOfTime.SECONDS,
@@ -60,8 +87,10 @@ MOWER_SENSORS = [
         state_class=SensorStateClass.TOTAL,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:timer",
+        value_fn=_statistic("total_cutting_time"),
+        data_keys=("total_cutting_time",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Total charging time",
         key="totalChargingTime",
         unit_of_measurement=UnitOfTime.SECONDS,
@@ -69,8 +98,10 @@ MOWER_SENSORS = [
         state_class=SensorStateClass.TOTAL,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:timer",
+        value_fn=_statistic("total_charging_time"),
+        data_keys=("total_charging_time",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Total searching time",
         key="totalSearchingTime",
         unit_of_measurement=UnitOfTime.SECONDS,
@@ -78,8 +109,10 @@ MOWER_SENSORS = [
         state_class=SensorStateClass.TOTAL,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:timer",
+        value_fn=_statistic("total_searching_time"),
+        data_keys=("total_searching_time",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Total number of collisions",
         key="numberOfCollisions",
         unit_of_measurement=None,
@@ -87,8 +120,10 @@ MOWER_SENSORS = [
         state_class=SensorStateClass.TOTAL,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:alert-circle",
+        value_fn=_statistic("number_of_collisions"),
+        data_keys=("number_of_collisions",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Total number of charging cycles",
         key="numberOfChargingCycles",
         unit_of_measurement=None,
@@ -96,17 +131,21 @@ MOWER_SENSORS = [
         state_class=SensorStateClass.TOTAL,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:repeat-variant",
+        value_fn=_statistic("number_of_charging_cycles"),
+        data_keys=("number_of_charging_cycles",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Total cutting blade usage",
-        key="totalChargingTime",
+        key="cuttingBladeUsageTime",
         unit_of_measurement=UnitOfTime.SECONDS,
         device_class=SensorDeviceClass.DURATION,
         state_class=SensorStateClass.TOTAL,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:blade",
+        value_fn=_statistic("cutting_blade_usage_time"),
+        data_keys=("cutting_blade_usage_time",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Error code",
         key="errorCode",
         unit_of_measurement=None,
@@ -114,8 +153,10 @@ MOWER_SENSORS = [
         state_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:alert-decagram",
+        value_fn=lambda data: data.error_code,
+        data_keys=("error_code",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Error description",
         key="errorDescription",
         unit_of_measurement=None,
@@ -123,8 +164,10 @@ MOWER_SENSORS = [
         state_class=None,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:alert-decagram",
+        value_fn=lambda data: data.error_description,
+        data_keys=("error_code",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Total number of messages in the queue",
         key="NumberOfMessages",
         unit_of_measurement=None,
@@ -132,8 +175,10 @@ MOWER_SENSORS = [
         state_class=SensorStateClass.TOTAL,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:email-variant",
+        value_fn=lambda data: data.number_of_messages,
+        data_keys=("number_of_messages",),
     ),
-    SensorEntityDescription(
+    AutomowerSensorEntityDescription(
         name="Remaining Charge Time",
         key="RemainingChargingTime",
         unit_of_measurement=UnitOfTime.SECONDS,
@@ -141,9 +186,51 @@ MOWER_SENSORS = [
         state_class=SensorStateClass.TOTAL,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:power-plug-battery",
+        value_fn=lambda data: data.remaining_charging_time,
+        data_keys=("remaining_charging_time",),
+    ),
+]
+
+# Link statistics from coordinator.metrics, off unless enabled by the user
+METRIC_SENSORS = [
+    SensorEntityDescription(
+        name="Last poll duration",
+        key="poll_duration",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-sand",
+    ),
+    SensorEntityDescription(
+        name="Last connect duration",
+        key="connect_duration",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:bluetooth-connect",
+    ),
+    SensorEntityDescription(
+        name="Command failures",
+        key="command_failures",
+        native_unit_of_measurement=None,
+        device_class=None,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:bluetooth-off",
     ),
 ]
 
+# Metric behind each duration sensor
+METRIC_NAMES = {
+    "poll_duration": "poll",
+    "connect_duration": "connect",
+}
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -153,18 +240,19 @@ async def async_setup_entry(
     coordinator: HusqvarnaCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     _LOGGER.debug("Creating mower sensors")
     sensors = [AutomowerSensorEntity(coordinator, description, "automower_" + format_mac(coordinator.address)) for description in MOWER_SENSORS]
+    sensors += [AutomowerMetricSensorEntity(coordinator, description, "automower_" + format_mac(coordinator.address)) for description in METRIC_SENSORS]
     #_LOGGER.debug("About to add sensors: " + str(sensors))
     if not sensors:
         _LOGGER.error("No sensors were created. Check MOWER_SENSORS.")
     async_add_entities(sensors)
 
-class AutomowerSensorEntity(CoordinatorEntity, SensorEntity):
+class AutomowerSensorEntity(HusqvarnaAutomowerBleEntity, SensorEntity):
 
-    _attr_has_entity_name = True
+    entity_description: AutomowerSensorEntityDescription
 
-    def __init__(self,coordinator: HusqvarnaCoordinator, description: SensorEntityDescription, mower_id: str) -> None:
+    def __init__(self,coordinator: HusqvarnaCoordinator, description: AutomowerSensorEntityDescription, mower_id: str) -> None:
         """Set up AutomowerSensors."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, description.data_keys)
         self.entity_description = description
 
         self._attr_unique_id = f"{mower_id}_{description.key}"
@@ -179,10 +267,11 @@ class AutomowerSensorEntity(CoordinatorEntity, SensorEntity):
         self._attributes = {"description": description.name, "last_updated": None}
 #        self._attr_extra_state_attributes = {"last_updated": None}
 
-        _LOGGER.debug("in AutomowerSensorEntity creating entity for: " + str(self._name) + "with unique_id: " + str(self._attr_unique_id))
+        _LOGGER.debug("in AutomowerSensorEntity creating entity for: %s with unique_id: %s", self._name, self._attr_unique_id)
 
-#        super().__init__(coordinator)
-#        self._update_attr()
+        # Value, availability and staleness last written to the state machine
+        self._last_shown: tuple[Any, bool, bool] | None = None
+        self._update_attr()
 
     @property
     def name(self):
@@ -191,57 +280,8 @@ class AutomowerSensorEntity(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        """Return the state of the sensor."""
-        _LOGGER.debug("in state sensor code")
-        self._attr_native_value = None
-        # Special case for errorDescription
-        if self.entity_description.key == "errorDescription":
-            try:
-                error_code = self.coordinator.data.get("errorCode", None)
-                if error_code is None:
-                    stats_dict = self.coordinator.data.get("statistics", {})
-                    error_code = stats_dict.get("errorCode", None)
-                if error_code is not None:
-                    self._attr_native_value = ERROR_CODE_DESCRIPTIONS.get(error_code, f"Unknown error ({error_code})")
-                    self._attr_available = True
-                    return self._attr_native_value
-            except Exception as e:
-                _LOGGER.error("Failed to map error code: %s", e)
-                return "Error"
-        try:
-            self._attr_native_value = self.coordinator.data[self.entity_description.key]
-            self._attr_available = self._attr_native_value is not None
-            _LOGGER.debug("Update sensor %s with value %s", self.entity_description.key, self._attr_native_value)
-            return self._attr_native_value
-        except KeyError:
-            self._attr_native_value = None
-            #_LOGGER.error(
-            #    "%s not a valid attribute (in state)",
-            #    self.entity_description.key,
-            #)
-            # pass to allow it to try the next method
-            pass
-        try:
-            # trying alternative search
-            stats_dict  = self.coordinator.data["statistics"]
-            self._attr_native_value = stats_dict[self.entity_description.key]
-            self._attr_available = self._attr_native_value is not None
-            _LOGGER.debug("Update sensor %s with value %s", self.entity_description.key, self._attr_native_value)
-            return self._attr_native_value
-        except KeyError:
-            self._attr_native_value = None
-            _LOGGER.error(
-                "%s not a valid attribute (in state) - second deep search fail",
-                self.entity_description.key,
-            )
-            return None
-
-    @property
-    def available(self):
-        """Return if the sensor is available."""
-        if self.coordinator._last_successful_update is None:
-            return False
-        return datetime.now() - self.coordinator._last_successful_update < timedelta(hours=1)
+        """Return the state of the sensor, resolved once per coordinator update."""
+        return self._attr_native_value
 
     @property
     def unit_of_measurement(self):
@@ -261,7 +301,7 @@ class AutomowerSensorEntity(CoordinatorEntity, SensorEntity):
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        return self._attributes
+        return {**self._attributes, "stale": self.coordinator.data_is_restored}
 
     @property
     def entity_category(self):
@@ -275,52 +315,29 @@ class AutomowerSensorEntity(CoordinatorEntity, SensorEntity):
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle coordinator update."""
-        self._update_attr()
-        super()._handle_coordinator_update()
+        """Handle coordinator update, writing state only when it changed."""
+        if self._update_attr():
+            self.async_write_ha_state()
 
     @callback
-    def _update_attr(self) -> None:
-        """Update attributes for sensor."""
-        _LOGGER.debug("in _update_attr code")
-        self._attr_native_value = None
-        try:
-            self._attr_native_value = self.coordinator.data[self.entity_description.key]
-            self._attr_available = self._attr_native_value is not None
-            _LOGGER.debug("Update sensor %s with value %s", self.entity_description.key, self._attr_native_value)
-            return self._attr_native_value
-        except KeyError:
-            self._attr_native_value = None
-            #_LOGGER.error(
-            #    "%s not a valid attribute (in _update_attr)",
-            #    self.entity_description.key,
-            #)
-            # Removing logger to silently switch to alternative method
-            # pass to allow it to try the next method
-            pass
-        try:
-            # trying alternative search
-            stats_dict  = self.coordinator.data["statistics"]
-            _LOGGER.debug("Attempting deep search in array for key - data in struct - " + str(type(stats_dict)))
-            self._attr_native_value = stats_dict[self.entity_description.key]
-            self._attr_available = self._attr_native_value is not None
-            _LOGGER.debug("Update sensor %s with value %s", self.entity_description.key, self._attr_native_value)
-            return self._attr_native_value
-        except KeyError:
-            self._attr_native_value = None
-            _LOGGER.error(
-                "%s not a valid attribute (in _update_attr) - second deep search fail",
-                self.entity_description.key,
-            )
+    def _update_attr(self) -> bool:
+        """Update the value of the sensor and return if what is shown changed."""
+        data = self.coordinator.data
+        value = None if data is None else self.entity_description.value_fn(data)
+        shown = (value, self.available, self.coordinator.data_is_restored)
+        if shown == self._last_shown:
+            return False
+
+        _LOGGER.debug("Update sensor %s with value %s", self.entity_description.key, value)
+        self._attr_native_value = value
+        self._last_shown = shown
+        return True
 
     @property
     def device_info(self):
         """Return device information about this entity."""
-        return {
-            "identifiers": {(DOMAIN, self.coordinator.serial)},
-            "manufacturer": MANUFACTURER,
-            "model": self.coordinator.model,
-        }
+        return self.coordinator.device_info
+
 #    async def async_update(self):
 #        """Update attributes for sensor."""
 #        self._attr_native_value = None
@@ -334,3 +351,28 @@ class AutomowerSensorEntity(CoordinatorEntity, SensorEntity):
 #                "%s not a valid attribute (in async_update)",
 #                self.entity_description.key,
 #            )
+
+
+class AutomowerMetricSensorEntity(HusqvarnaAutomowerBleEntity, SensorEntity):
+    """Diagnostic sensor showing how the link to the mower performs."""
+
+    def __init__(self, coordinator: HusqvarnaCoordinator, description: SensorEntityDescription, mower_id: str) -> None:
+        """Set up the metric sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{mower_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Metrics are kept in memory and always available."""
+        return True
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the metric value."""
+        metrics = self.coordinator.metrics
+        if self.entity_description.key == "command_failures":
+            return metrics.failures
+        duration = metrics.last_ms(METRIC_NAMES[self.entity_description.key])
+        return None if duration is None else round(duration)
@@ -0,0 +1,326 @@
+"""BLE session handling for a single Husqvarna Automower."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Any
+
+from automower_ble.mower import Mower
+from bleak import BleakError
+from bleak_retry_connector import close_stale_connections_by_address, get_device
+
+from homeassistant.components import bluetooth
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+
+from .backoff import ReconnectBackoff
+from .metrics import MowerMetrics
+from .scheduler import AdapterScheduler, Priority, PriorityLock
+from .trace import TraceRecorder
+
+_LOGGER = logging.getLogger(__name__)
+
+KEEPALIVE_INTERVAL = timedelta(minutes=5)
+
+
+class MowerConnectionError(Exception):
+    """Raised when the mower can't be found or connected to."""
+
+
+class MowerSession:
+    """Own the BLE connection to one mower.
+
+    Only one connect attempt runs at a time, callers arriving while it is in
+    progress wait for the same attempt. Commands are serialised so polls and
+    user actions never talk over each other. After a failed connect, polls
+    back off before trying again while user actions always get an attempt.
+    With a scheduler, a slot on the mower's adapter is held from connecting
+    until disconnecting. When other mowers wait for a slot the connection is
+    given up as soon as it is idle, and a poll using it is asked to stop
+    early when a user action waits.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        mower: Mower,
+        address: str,
+        keepalive_interval: timedelta | None = KEEPALIVE_INTERVAL,
+        idle_timeout: timedelta | None = None,
+        scheduler: AdapterScheduler | None = None,
+    ) -> None:
+        """Initialize the session."""
+        self.hass = hass
+        self.mower = mower
+        self.address = address
+        self.scheduler = scheduler
+        self.metrics = MowerMetrics()
+        self.backoff = ReconnectBackoff()
+        self.keepalive_interval = keepalive_interval
+        self.idle_timeout = idle_timeout
+        self._connect_task: asyncio.Task[None] | None = None
+        # A user action waiting for the mower goes before a waiting poll
+        self._lock = PriorityLock()
+        # Priority of the caller holding the mower, if any
+        self._in_use: Priority | None = None
+        # Set when a waiting user action wants the connection of a running poll
+        self.yield_requested = False
+        # Whether the current connection has been used, a new one isn't given up
+        # before the caller it was made for had its turn
+        self._used = False
+        self._last_used = time.monotonic()
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        # How long the mower held an adapter slot, to weigh against connect costs
+        self._started = time.monotonic()
+        self._connected_at: float | None = None
+        self.connected_seconds = 0.0
+        self.releases = 0
+        # Set when the calls to the mower are recorded
+        self.trace: TraceRecorder | None = None
+
+    def is_connected(self) -> bool:
+        """Return if the mower is connected."""
+        try:
+            return self.mower.is_connected()
+        except AttributeError:
+            # Mower.is_connected reads a client that only exists after connect()
+            return False
+
+    def _release_slot(self) -> None:
+        """Give back the adapter slot of the connection, if adapters are shared."""
+        if self.scheduler is not None:
+            self.scheduler.release(self.address)
+
+    def _check_backoff(self, priority: Priority) -> None:
+        """Refuse a background connect while backing off."""
+        if (
+            priority is Priority.POLL
+            and self._connect_task is None
+            and not self.is_connected()
+            and not self.backoff.ready()
+        ):
+            raise MowerConnectionError(
+                f"Not reconnecting for another {self.backoff.retry_in:.0f}s"
+            )
+
+    async def async_connect(self, priority: Priority = Priority.POLL) -> None:
+        """Connect to the mower, joining an attempt already in progress."""
+        if self.is_connected():
+            return
+        self._check_backoff(priority)
+        await self._async_connect_shared(priority)
+
+    async def _async_connect_shared(self, priority: Priority) -> None:
+        """Start a connect attempt or wait for the one in progress."""
+        if self.is_connected():
+            return
+
+        if self._connect_task is None:
+            self._connect_task = self.hass.async_create_background_task(
+                self._async_connect(priority),
+                f"husqvarna_automower_ble connect {self.address}",
+            )
+            self._connect_task.add_done_callback(self._connect_done)
+        else:
+            _LOGGER.debug("Waiting on connect already in progress for %s", self.address)
+
+        # Shield so one cancelled caller doesn't abort the attempt for the others
+        await asyncio.shield(self._connect_task)
+
+    def _connect_done(self, task: asyncio.Task[None]) -> None:
+        """Forget the finished connect attempt."""
+        if self._connect_task is task:
+            self._connect_task = None
+
+    async def _async_connect(self, priority: Priority) -> None:
+        """Run a single connect attempt."""
+        if self.scheduler is not None:
+            await self.scheduler.async_acquire(
+                self.address, priority, self._async_contended
+            )
+        try:
+            with self.metrics.measure("connect"):
+                await self._async_connect_device()
+        except MowerConnectionError:
+            self._release_slot()
+            self.backoff.record_failure()
+            _LOGGER.debug(
+                "Next connect to %s in %.0fs", self.address, self.backoff.delay
+            )
+            raise
+        except BaseException:
+            self._release_slot()
+            raise
+        self.backoff.reset()
+        self._used = False
+        self._mark_disconnected()
+        self._connected_at = self._last_used = time.monotonic()
+        self._start_timer()
+
+    async def _async_connect_device(self) -> None:
+        """Find the mower and connect to it."""
+        _LOGGER.debug("Trying to connect to %s", self.address)
+        await close_stale_connections_by_address(self.address)
+
+        device = bluetooth.async_ble_device_from_address(
+            self.hass, self.address, connectable=True
+        ) or await get_device(self.address)
+        if not device:
+            _LOGGER.debug("Can't find device")
+            raise MowerConnectionError("Can't find device")
+
+        try:
+            if not await self.mower.connect(device):
+                _LOGGER.debug("failed to connect in self.mower.connect")
+                raise MowerConnectionError("Failed to connect")
+        except (TimeoutError, BleakError) as ex:
+            _LOGGER.debug("except hit from ble connect")
+            raise MowerConnectionError("Failed to connect") from ex
+
+        _LOGGER.debug("connected and paired")
+
+    @asynccontextmanager
+    async def connection(
+        self, priority: Priority = Priority.POLL
+    ) -> AsyncIterator[Mower]:
+        """Connect if needed and hold the mower for exclusive use."""
+        self._check_backoff(priority)
+        await self._async_connect_shared(priority)
+        async with self._lock.hold(priority):
+            if not self.is_connected():
+                # Dropped while waiting, by an idle timeout or a release after a poll
+                self._check_backoff(priority)
+                await self._async_connect_shared(priority)
+            self._in_use = priority
+            try:
+                yield self.mower
+            finally:
+                self._in_use = None
+                self.yield_requested = False
+                self._used = True
+                self._last_used = time.monotonic()
+        if self.scheduler is not None and self.scheduler.contended(self.address):
+            self._schedule_yield()
+
+    def _async_contended(self, priority: Priority) -> None:
+        """Make room for a mower that has to wait for the adapter."""
+        if not self._lock.locked():
+            self._schedule_yield()
+        elif priority is Priority.USER and self._in_use is Priority.POLL:
+            # The poll stops early, the connection goes once it is done
+            _LOGGER.debug("Asking the poll of %s to make way", self.address)
+            self.yield_requested = True
+
+    def _schedule_yield(self) -> None:
+        """Give up the connection in the background."""
+        self.hass.async_create_background_task(
+            self._async_yield_connection(),
+            f"husqvarna_automower_ble yield {self.address}",
+        )
+
+    async def _async_yield_connection(self) -> None:
+        """Disconnect so a mower waiting for the adapter gets its turn."""
+        if (
+            self._lock.locked()
+            or not self._used
+            or not self.scheduler.contended(self.address)
+        ):
+            return
+        _LOGGER.debug("Releasing %s for a mower waiting on its adapter", self.address)
+        await self.async_disconnect()
+
+    def _start_timer(self) -> None:
+        """Start the keepalive and idle timeout check."""
+        if self._unsub_timer is not None:
+            return
+        periods = [
+            period
+            for period in (self.keepalive_interval, self.idle_timeout)
+            if period is not None
+        ]
+        if not periods:
+            return
+        self._unsub_timer = async_track_time_interval(
+            self.hass,
+            self._async_check_idle,
+            min(periods) / 2,
+            name=f"husqvarna_automower_ble keepalive {self.address}",
+        )
+
+    def _stop_timer(self) -> None:
+        """Stop the keepalive and idle timeout check."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def _async_check_idle(self, now: datetime) -> None:
+        """Send a keepalive or drop the connection once it has been idle."""
+        if self._lock.locked():
+            return
+        if not self.is_connected():
+            self._stop_timer()
+            self._mark_disconnected()
+            self._release_slot()
+            return
+        if self.scheduler is not None and self.scheduler.contended(self.address):
+            await self._async_yield_connection()
+            return
+
+        idle = timedelta(seconds=time.monotonic() - self._last_used)
+        if self.idle_timeout is not None and idle >= self.idle_timeout:
+            _LOGGER.debug("Connection to %s idle for %s, disconnecting", self.address, idle)
+            await self.async_disconnect()
+        elif self.keepalive_interval is not None and idle >= self.keepalive_interval:
+            _LOGGER.debug("Sending keepalive to %s", self.address)
+            try:
+                async with self._lock.hold():
+                    with self.metrics.measure("keepalive"):
+                        await self.mower.battery_level()
+                    self._last_used = time.monotonic()
+            except (TimeoutError, BleakError):
+                _LOGGER.debug("Keepalive to %s failed", self.address)
+
+    def _mark_disconnected(self) -> None:
+        """Add the time since the last connect to the connected time."""
+        if self._connected_at is not None:
+            self.connected_seconds += time.monotonic() - self._connected_at
+            self._connected_at = None
+
+    async def async_disconnect(self) -> None:
+        """Disconnect from the mower."""
+        self._stop_timer()
+        async with self._lock.hold(Priority.USER):
+            if self.is_connected():
+                await self.mower.disconnect()
+                self.releases += 1
+            self._mark_disconnected()
+            self._release_slot()
+
+    def connection_stats(self) -> dict[str, Any]:
+        """Return what connecting costs and how much the slot is held."""
+        connected = self.connected_seconds
+        if self._connected_at is not None:
+            connected += time.monotonic() - self._connected_at
+        connect = self.metrics.get("connect")
+        return {
+            "connects": connect.count,
+            "connect_failures": connect.timeout + connect.error,
+            "mean_connect_ms": (
+                round(connect.total_ms / connect.count, 1) if connect.count else None
+            ),
+            "releases": self.releases,
+            "connected_ratio": round(
+                connected / max(time.monotonic() - self._started, 1), 3
+            ),
+        }
+
+    async def async_close(self) -> None:
+        """Stop using the session and release the connection."""
+        if self._connect_task is not None:
+            self._connect_task.cancel()
+        await self.async_disconnect()
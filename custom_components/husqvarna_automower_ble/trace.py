@@ -0,0 +1,237 @@
+"""Opt-in recording of everything sent to a mower, for replay without one."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from automower_ble.mower import Mower
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .pipeline import CommandPipeline
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+# Directory under the Home Assistant configuration holding the traces
+TRACE_DIR = f"{DOMAIN}_traces"
+# Lines buffered in memory before they are appended to the file
+FLUSH_LINES = 200
+# Recording stops after this many lines, about a week of polling once a minute
+MAX_LINES = 100_000
+
+# Set while a traced call runs, the calls it makes itself aren't recorded
+_IN_CALL: ContextVar[bool] = ContextVar("husqvarna_automower_ble_trace_call", default=False)
+
+# Mower methods recorded besides command(), the arguments aren't recorded
+TRACED_METHODS = (
+    "connect",
+    "disconnect",
+    "get_model",
+    "battery_level",
+    "mower_activity",
+    "mower_state",
+    "mower_next_start_time",
+    "mower_resume",
+    "mower_override",
+    "mower_park",
+    "mower_pause",
+)
+
+
+def trace_path(hass: HomeAssistant, address: str) -> str:
+    """Return the path of a new trace of a mower."""
+    mac = format_mac(address).replace(":", "")
+    return hass.config.path(TRACE_DIR, f"{mac}-{dt_util.now():%Y%m%d-%H%M%S}.jsonl.gz")
+
+
+def _jsonable(value: Any) -> Any:
+    """Return a value in a form json can write."""
+    if isinstance(value, bytes | bytearray):
+        return value.hex()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+class TraceRecorder:
+    """Write every call to the mower, with its outcome and timing, to disk.
+
+    The trace is gzip compressed JSON, one line per call. The first line
+    describes the mower, the others are either a call with its parameters,
+    result or exception, start time and duration, or a mark of what the
+    integration was doing (a poll, an event, a user action) so a replay can
+    do the same in the same order. Responses that arrived through the
+    pipeline are recorded as calls too, with a share of the batch time.
+    Buffered lines are appended to the file as extra gzip members, which
+    gzip reads back as one stream.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, path: str, header: Mapping[str, Any]
+    ) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.path = path
+        self.lines = 0
+        self._start = time.monotonic()
+        self._pending: list[str] = []
+        self._lock = asyncio.Lock()
+        self._append(
+            {
+                "trace": TRACE_VERSION,
+                "started": dt_util.utcnow().isoformat(),
+                **_jsonable(header),
+            }
+        )
+
+    @property
+    def recording(self) -> bool:
+        """Return if there is room left in the trace."""
+        return self.lines < MAX_LINES
+
+    def wrap(self, mower: Mower) -> None:
+        """Record the calls made to a mower from now on.
+
+        Only the outermost call is recorded, so battery_level is recorded
+        without the GetBatteryLevel command it sends.
+        """
+        for name in ("command", *TRACED_METHODS):
+            if (method := getattr(mower, name, None)) is not None:
+                setattr(mower, name, self._traced(name, method))
+
+    def wrap_pipeline(self, pipeline: CommandPipeline) -> None:
+        """Record the responses of pipelined batches as calls."""
+        async_run = pipeline.async_run
+
+        @wraps(async_run)
+        async def traced(batch: Sequence[tuple[str, Mapping[str, Any]]]) -> dict[str, Any]:
+            start = time.monotonic()
+            try:
+                responses = await async_run(batch)
+            except BaseException as ex:
+                for name, params in batch:
+                    self._record(name, params, start, len(batch), error=ex)
+                raise
+            for name, params in batch:
+                if name in responses:
+                    self._record(
+                        name, params, start, len(batch), result=responses[name]
+                    )
+            return responses
+
+        pipeline.async_run = traced
+
+    def _traced(
+        self, name: str, method: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        """Return a method that records its calls."""
+
+        @wraps(method)
+        async def traced(*args: Any, **kwargs: Any) -> Any:
+            if _IN_CALL.get():
+                return await method(*args, **kwargs)
+            token = _IN_CALL.set(True)
+            call, params = (args[0], kwargs) if name == "command" else (name, {})
+            start = time.monotonic()
+            try:
+                result = await method(*args, **kwargs)
+            except BaseException as ex:
+                self._record(call, params, start, error=ex)
+                raise
+            finally:
+                _IN_CALL.reset(token)
+            self._record(call, params, start, result=result)
+            return result
+
+        return traced
+
+    @callback
+    def mark(self, kind: str, **details: Any) -> None:
+        """Record what the integration is about to do."""
+        self._append(
+            {"at": self._offset(time.monotonic()), "mark": kind, **_jsonable(details)}
+        )
+
+    def _record(
+        self,
+        call: str,
+        params: Mapping[str, Any],
+        start: float,
+        share: int = 1,
+        result: Any = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record one call and its outcome."""
+        entry: dict[str, Any] = {
+            "at": self._offset(start),
+            "call": call,
+            "ms": round((time.monotonic() - start) * 1000 / share, 1),
+        }
+        if params:
+            entry["params"] = _jsonable(params)
+        if share > 1:
+            entry["pipelined"] = True
+        if error is not None:
+            entry["error"] = type(error).__name__
+            entry["message"] = str(error)
+        else:
+            entry["result"] = _jsonable(result)
+        self._append(entry)
+
+    def _offset(self, when: float) -> float:
+        """Return the seconds since the trace started."""
+        return round(when - self._start, 3)
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        """Buffer a line and write the buffer out when it is full."""
+        if not self.recording:
+            return
+        self._pending.append(json.dumps(entry, separators=(",", ":")))
+        self.lines += 1
+        if not self.recording:
+            _LOGGER.info("Trace %s is full, no longer recording", self.path)
+        if len(self._pending) >= FLUSH_LINES or not self.recording:
+            self.hass.async_create_background_task(
+                self.async_flush(), f"{DOMAIN} trace flush"
+            )
+
+    async def async_flush(self) -> None:
+        """Append the buffered lines to the file."""
+        # The lock keeps flushes in order
+        async with self._lock:
+            lines, self._pending = self._pending, []
+            if lines:
+                await self.hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines to the file, in the executor."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+def read_trace(path: str) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Return the header and the entries of a trace."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        entries = [json.loads(line) for line in file if line.strip()]
+    if not entries or entries[0].get("trace") != TRACE_VERSION:
+        raise ValueError(f"{path} is not a version {TRACE_VERSION} trace")
+    return entries[0], entries[1:]
@@ -0,0 +1,207 @@
+"""Per-day usage derived from the mower's lifetime counters."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .models import MowerStatistics
+
+if TYPE_CHECKING:
+    from homeassistant.components.recorder.models import StatisticMetaData
+
+_LOGGER = logging.getLogger(__name__)
+
+# Days of deltas kept, a week plus the day in progress
+DAYS_KEPT = 8
+RATE_DAYS = 7
+
+# Counters turned into daily deltas, with the factor converting them
+COUNTERS: dict[str, float] = {
+    "total_cutting_time": 1 / 3600,
+    "number_of_collisions": 1,
+    "number_of_charging_cycles": 1,
+}
+
+# Long-term statistics of the counters: (suffix, label, unit, counter)
+SUM_STATISTICS = (
+    ("cutting_hours", "cutting time", UnitOfTime.HOURS, "total_cutting_time"),
+    ("collisions", "collisions", None, "number_of_collisions"),
+    ("charging_cycles", "charging cycles", None, "number_of_charging_cycles"),
+)
+# Long-term statistics of the rates: (suffix, label, unit)
+RATE_STATISTICS = (
+    ("cutting_hours_per_day", "cutting hours per day", UnitOfTime.HOURS),
+    ("collisions_per_hour_cut", "collisions per hour cut", None),
+    ("charging_cycles_per_week", "charging cycles per week", None),
+)
+
+
+class UsageAggregator:
+    """Turn successive counter snapshots into per-day deltas and rates.
+
+    The counters only ever grow, so the difference between two snapshots is
+    exactly what happened in between however far apart they were read, and
+    nothing has to be looked up in the recorder. The counters are imported as
+    hourly long-term statistics, from which Home Assistant derives daily and
+    weekly changes, and the rates as one mean per day.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the aggregator."""
+        self._last: dict[str, int] | None = None
+        self._last_at: datetime | None = None
+        # Deltas per local day, in hours for the cutting time, credited to
+        # the day of the later of the two snapshots
+        self.days: dict[date, dict[str, float]] = {}
+
+    def add(self, statistics: MowerStatistics, when: datetime) -> bool:
+        """Fold in a new snapshot, return if any counter moved."""
+        counters = {
+            name: value
+            for name in COUNTERS
+            if (value := getattr(statistics, name)) is not None
+        }
+        last, self._last, self._last_at = self._last, counters, when
+        if last is None:
+            return False
+
+        day = self.days.setdefault(dt_util.as_local(when).date(), {})
+        moved = False
+        for name, factor in COUNTERS.items():
+            if name not in counters or name not in last:
+                continue
+            delta = counters[name] - last[name]
+            if delta < 0:
+                # Counters were reset, start again from the new value
+                _LOGGER.debug("%s went back from %s to %s", name, last[name], counters[name])
+                continue
+            if delta:
+                day[name] = day.get(name, 0) + delta * factor
+                moved = True
+
+        for old in sorted(self.days)[:-DAYS_KEPT]:
+            del self.days[old]
+        return moved
+
+    def _window(self, today: date) -> list[dict[str, float]]:
+        """Return the deltas of the days making up the rates."""
+        first = today - timedelta(days=RATE_DAYS - 1)
+        return [deltas for day, deltas in self.days.items() if first <= day <= today]
+
+    def rates(self, today: date) -> dict[str, float | None]:
+        """Return the rates over the week up to and including a day."""
+        window = self._window(today)
+        if not window:
+            return dict.fromkeys(name for name, *_ in RATE_STATISTICS)
+
+        totals = {
+            name: sum(deltas.get(name, 0) for deltas in window) for name in COUNTERS
+        }
+        cutting_hours = totals["total_cutting_time"]
+        return {
+            "cutting_hours_per_day": round(cutting_hours / len(window), 2),
+            "collisions_per_hour_cut": (
+                round(totals["number_of_collisions"] / cutting_hours, 2)
+                if cutting_hours
+                else None
+            ),
+            "charging_cycles_per_week": round(
+                totals["number_of_charging_cycles"] * RATE_DAYS / len(window), 1
+            ),
+        }
+
+    @callback
+    def async_import(self, hass: HomeAssistant, mower_id: str, name: str) -> None:
+        """Import the latest snapshot and today's rates as long-term statistics.
+
+        Only called with the recorder set up, which is an optional dependency.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.recorder.models import StatisticData
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+
+        if self._last is None or self._last_at is None:
+            return
+
+        hour = dt_util.as_utc(self._last_at).replace(minute=0, second=0, microsecond=0)
+        for suffix, label, unit, counter in SUM_STATISTICS:
+            if (value := self._last.get(counter)) is None:
+                continue
+            value *= COUNTERS[counter]
+            async_add_external_statistics(
+                hass,
+                self._metadata(mower_id, name, suffix, label, unit, has_sum=True),
+                [StatisticData(start=hour, state=value, sum=value)],
+            )
+
+        today = dt_util.as_local(self._last_at).date()
+        day_start = dt_util.as_utc(dt_util.start_of_local_day(today)).replace(
+            minute=0, second=0, microsecond=0
+        )
+        rates = self.rates(today)
+        for suffix, label, unit in RATE_STATISTICS:
+            if (value := rates[suffix]) is None:
+                continue
+            async_add_external_statistics(
+                hass,
+                self._metadata(mower_id, name, suffix, label, unit, has_sum=False),
+                [
+                    StatisticData(
+                        start=day_start, state=value, mean=value, min=value, max=value
+                    )
+                ],
+            )
+
+    @staticmethod
+    def _metadata(
+        mower_id: str,
+        name: str,
+        suffix: str,
+        label: str,
+        unit: str | None,
+        has_sum: bool,
+    ) -> StatisticMetaData:
+        """Return the metadata of one statistic."""
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.recorder.models import StatisticMetaData
+
+        return StatisticMetaData(
+            has_mean=not has_sum,
+            has_sum=has_sum,
+            name=f"{name} {label}",
+            source=DOMAIN,
+            statistic_id=f"{DOMAIN}:{mower_id}_{suffix}",
+            unit_of_measurement=unit,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {
+            "last": self._last,
+            "last_at": self._last_at.isoformat() if self._last_at else None,
+            "days": {day.isoformat(): deltas for day, deltas in self.days.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> UsageAggregator:
+        """Restore the state persisted by as_dict."""
+        aggregator = cls()
+        aggregator._last = data.get("last")
+        if last_at := data.get("last_at"):
+            aggregator._last_at = datetime.fromisoformat(last_at)
+        aggregator.days = {
+            date.fromisoformat(day): dict(deltas)
+            for day, deltas in data.get("days", {}).items()
+        }
+        return aggregator
@@ -0,0 +1,272 @@
+"""Benchmark polling and commands against a simulated mower.
+
+Drives HusqvarnaCoordinator._async_update_data and the lawn mower command
+queue against FakeMower and reports poll latency, BLE round trips per cycle
+and how the integration behaves under injected failures. It also counts
+how many entity state writes each poll causes.
+
+Run from the repository root with Home Assistant and the integration's
+requirements installed:
+
+    python scripts/benchmark.py --cycles 20
+    python scripts/benchmark.py --scenario flaky --cycles 50
+    python scripts/benchmark.py --no-pipeline
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import logging
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fake_mower import FakeMower, FakeMowerConfig  # noqa: E402
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.exceptions import HomeAssistantError  # noqa: E402
+from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
+
+from custom_components.husqvarna_automower_ble.command_queue import (  # noqa: E402
+    MowerAction,
+)
+from custom_components.husqvarna_automower_ble.coordinator import (  # noqa: E402
+    HusqvarnaCoordinator,
+)
+from custom_components.husqvarna_automower_ble.lawn_mower import (  # noqa: E402
+    FEATURES,
+    AutomowerLawnMower,
+)
+from custom_components.husqvarna_automower_ble.sensor import (  # noqa: E402
+    MOWER_SENSORS,
+    AutomowerSensorEntity,
+)
+from custom_components.husqvarna_automower_ble.session import (  # noqa: E402
+    MowerSession,
+)
+
+ADDRESS = "00:11:22:33:44:55"
+
+SCENARIOS: dict[str, FakeMowerConfig] = {
+    "ideal": FakeMowerConfig(latency=0.05, connect_latency=0.5, seed=1),
+    "slow": FakeMowerConfig(latency=0.15, connect_latency=2.0, seed=1),
+    "flaky": FakeMowerConfig(
+        latency=0.05, connect_latency=0.5, error_rate=0.05, dropout_rate=0.02, seed=1
+    ),
+    "timeouts": FakeMowerConfig(
+        latency=0.05, connect_latency=0.5, timeout_rate=0.05, timeout=2.0, seed=1
+    ),
+}
+
+
+@dataclass
+class Result:
+    """Measurements of one kind of operation."""
+
+    durations: list[float] = field(default_factory=list)
+    round_trips: list[int] = field(default_factory=list)
+    connects: int = 0
+    failures: int = 0
+
+    def add(self, duration: float, mower: FakeMower, failed: bool) -> None:
+        """Record one operation."""
+        self.durations.append(duration)
+        self.round_trips.append(sum(mower.round_trips.values()))
+        self.connects += mower.connects
+        self.failures += failed or bool(mower.failures)
+
+    def row(self, name: str) -> str:
+        """Format the result as a table row."""
+        if not self.durations:
+            return f"{name:<22} {'-':>8}"
+        return (
+            f"{name:<22} {len(self.durations):>5} "
+            f"{statistics.median(self.durations) * 1000:>9.0f} "
+            f"{max(self.durations) * 1000:>9.0f} "
+            f"{statistics.mean(self.round_trips):>8.1f} "
+            f"{self.connects:>8} {self.failures:>8}"
+        )
+
+
+async def _async_poll(
+    coordinator: HusqvarnaCoordinator, mower: FakeMower, result: Result
+) -> None:
+    """Run and measure one poll cycle."""
+    mower.reset_counters()
+    start = time.perf_counter()
+    failed = False
+    try:
+        await coordinator._async_update_data()  # noqa: SLF001
+    except UpdateFailed:
+        failed = True
+    result.add(time.perf_counter() - start, mower, failed)
+
+
+async def _async_command(
+    coordinator: HusqvarnaCoordinator,
+    mower: FakeMower,
+    result: Result,
+    *actions: MowerAction,
+) -> None:
+    """Run and measure actions submitted together."""
+    mower.reset_counters()
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(coordinator.command_queue.async_submit(action) for action in actions),
+        return_exceptions=True,
+    )
+    failed = any(isinstance(outcome, HomeAssistantError) for outcome in outcomes)
+    result.add(time.perf_counter() - start, mower, failed)
+
+
+async def async_run_scenario(
+    hass: HomeAssistant,
+    name: str,
+    config: FakeMowerConfig,
+    cycles: int,
+    pipelining: bool = True,
+) -> dict[str, Result]:
+    """Benchmark one scenario."""
+    mower = FakeMower(address=ADDRESS, config=config)
+    session = MowerSession(hass, mower, ADDRESS, keepalive_interval=None)
+    coordinator = HusqvarnaCoordinator(hass, session, ADDRESS, "305", 1, "123456789")
+    # Nothing advertises here, polls would be skipped as out of range
+    coordinator.presence.in_range = True
+    coordinator.pipeline.enabled = pipelining
+
+    results = {
+        "first poll": Result(),
+        "steady polls": Result(),
+        "single command": Result(),
+        "burst of 3 commands": Result(),
+    }
+
+    await _async_poll(coordinator, mower, results["first poll"])
+    for _ in range(cycles):
+        await _async_poll(coordinator, mower, results["steady polls"])
+
+    for action in (MowerAction.START, MowerAction.PAUSE, MowerAction.DOCK):
+        await _async_command(coordinator, mower, results["single command"], action)
+    await _async_command(
+        coordinator,
+        mower,
+        results["burst of 3 commands"],
+        MowerAction.PAUSE,
+        MowerAction.START,
+        MowerAction.DOCK,
+    )
+
+    await coordinator.async_shutdown()
+    return results
+
+
+async def async_count_state_writes(
+    hass: HomeAssistant, config: FakeMowerConfig, cycles: int, pipelining: bool = True
+) -> list[int]:
+    """Return the number of entity state writes caused by each poll.
+
+    The battery level drops by one every other poll, everything else stays
+    the same, so ideally only the battery sensor writes on those polls.
+    """
+    mower = FakeMower(address=ADDRESS, config=config)
+    session = MowerSession(hass, mower, ADDRESS, keepalive_interval=None)
+    coordinator = HusqvarnaCoordinator(hass, session, ADDRESS, "305", 1, "123456789")
+    # Nothing advertises here, polls would be skipped as out of range
+    coordinator.presence.in_range = True
+    coordinator.pipeline.enabled = pipelining
+
+    entities = [
+        AutomowerSensorEntity(coordinator, description, "automower_benchmark")
+        for description in MOWER_SENSORS
+    ]
+    entities.append(AutomowerLawnMower(coordinator, "automower_benchmark", "305", FEATURES))
+
+    writes = 0
+
+    def count_write() -> None:
+        nonlocal writes
+        writes += 1
+
+    for entity in entities:
+        entity.hass = hass
+        entity.async_write_ha_state = count_write
+        coordinator.async_add_listener(entity._handle_coordinator_update)  # noqa: SLF001
+
+    per_poll = []
+    for cycle in range(cycles + 1):
+        if cycle % 2:
+            mower.battery -= 1
+        writes = 0
+        await coordinator.async_refresh()
+        per_poll.append(writes)
+
+    await coordinator.async_shutdown()
+    return per_poll
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Run the selected scenarios and print a report."""
+    scenarios = SCENARIOS if args.scenario == "all" else {args.scenario: SCENARIOS[args.scenario]}
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        with (
+            patch(
+                "homeassistant.components.bluetooth.async_ble_device_from_address",
+                return_value=ADDRESS,
+            ),
+            patch(
+                "custom_components.husqvarna_automower_ble.session.close_stale_connections_by_address",
+                AsyncMock(),
+            ),
+        ):
+            for name, config in scenarios.items():
+                results = await async_run_scenario(
+                    hass, name, config, args.cycles, args.pipeline
+                )
+                print(f"\n== {name} ({'pipelined' if args.pipeline else 'sequential'}) ==")
+                print(
+                    f"{'operation':<22} {'count':>5} {'median ms':>9} "
+                    f"{'max ms':>9} {'trips':>8} {'connects':>8} {'failed':>8}"
+                )
+                for operation, result in results.items():
+                    print(result.row(operation))
+
+            writes = await async_count_state_writes(
+                hass, SCENARIOS["ideal"], args.cycles, args.pipeline
+            )
+            print("\n== state writes per poll ==")
+            print(f"first poll: {writes[0]}, then: {writes[1:]}")
+        await hass.async_stop(force=True)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=10, help="steady state polls to run")
+    parser.add_argument(
+        "--scenario", choices=["all", *SCENARIOS], default="all", help="scenario to run"
+    )
+    parser.add_argument(
+        "--no-pipeline",
+        dest="pipeline",
+        action="store_false",
+        help="send poll commands one at a time instead of pipelining them",
+    )
+    parser.add_argument("--debug", action="store_true", help="show integration debug logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    asyncio.run(async_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Simulated stand-in for automower_ble.mower.Mower.
+
+Implements the parts of the Mower interface the integration uses, with
+configurable per-command latency, dropped connections and injected
+BleakError/TimeoutError failures, so the integration can be exercised and
+benchmarked without a real mower. Requests written as raw frames are
+answered with response frames on the notification queue, so the command
+pipeline can be exercised too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from importlib.resources import files
+import json
+import random
+from typing import Any
+
+from automower_ble.helpers import crc
+from bleak import BleakError
+
+# Notifications are cut to the size the library uses
+MTU_SIZE = 20
+# Bytes of each request and response parameter type
+TYPE_SIZES = {"uint8": 1, "bool": 1, "uint16": 2, "uint32": 4, "tUnixTime": 4}
+
+# Values returned for mower.command(...) calls
+DEFAULT_RESPONSES: dict[str, Any] = {
+    "GetSerialNumber": 123456789,
+    "GetError": 0,
+    "GetNumberOfMessages": 3,
+    "GetRemainingChargingTime": 0,
+    "GetAllStatistics": {
+        "totalRunningTime": 1_000_000,
+        "totalCuttingTime": 900_000,
+        "totalChargingTime": 400_000,
+        "totalSearchingTime": 50_000,
+        "numberOfCollisions": 12_000,
+        "numberOfChargingCycles": 1_500,
+        "cuttingBladeUsageTime": 200_000,
+    },
+    "IsOperatorLoggedIn": False,
+    "GetMessage": {"time": 1_700_000_000, "code": 1, "severity": 1},
+}
+
+
+@dataclass
+class FakeMowerConfig:
+    """How the simulated mower behaves."""
+
+    # Seconds per request/response round trip, overlapping when pipelined
+    latency: float = 0.05
+    # Seconds the mower works on each request, one request at a time
+    processing: float = 0.01
+    # Per-command overrides of latency, keyed by command or method name
+    command_latency: dict[str, float] = field(default_factory=dict)
+    # Seconds a connect takes
+    connect_latency: float = 1.0
+    # Chance that a command raises BleakError
+    error_rate: float = 0.0
+    # Chance that a command hangs and raises TimeoutError
+    timeout_rate: float = 0.0
+    # Seconds a timed out command hangs before raising
+    timeout: float = 5.0
+    # Chance that the connection drops during a command
+    dropout_rate: float = 0.0
+    # Chance that a connect attempt fails
+    connect_failure_rate: float = 0.0
+    seed: int | None = None
+
+
+class FakeMower:
+    """Simulated Husqvarna Automower speaking the Mower interface."""
+
+    def __init__(
+        self,
+        channel_id: int = 1,
+        address: str = "00:00:00:00:00:00",
+        pin: int | None = None,
+        config: FakeMowerConfig | None = None,
+    ) -> None:
+        """Initialize the fake mower."""
+        self.channel_id = channel_id
+        self.address = address
+        self.pin = pin
+        self.config = config or FakeMowerConfig()
+        self.responses = dict(DEFAULT_RESPONSES)
+        self.battery = 100
+        self.state = 7  # restricted
+        self.activity = 1  # charging
+        self.connected = False
+        # Like Mower, whose client only exists after the first connect
+        self._has_client = False
+        self.round_trips: Counter[str] = Counter()
+        self.failures: Counter[str] = Counter()
+        self.connects = 0
+        self._random = random.Random(self.config.seed)
+        # What the command pipeline writes to and reads from, as on Mower
+        self.queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        with files("automower_ble").joinpath("protocol.json").open("r") as file:
+            self.protocol: dict[str, dict[str, Any]] = json.load(file)
+        self._commands = {
+            (spec["major"], spec["minor"]): name for name, spec in self.protocol.items()
+        }
+        self._busy = asyncio.Lock()
+        self._answers: set[asyncio.Task[None]] = set()
+
+    def reset_counters(self) -> None:
+        """Forget the round trips and failures seen so far."""
+        self.round_trips.clear()
+        self.failures.clear()
+        self.connects = 0
+
+    def is_connected(self) -> bool:
+        """Return if the simulated link is up."""
+        if not self._has_client:
+            raise AttributeError("'FakeMower' object has no attribute 'client'")
+        return self.connected
+
+    async def connect(self, device: Any) -> bool:
+        """Simulate connecting and pairing."""
+        self.connects += 1
+        self._has_client = True
+        await asyncio.sleep(self.config.connect_latency)
+        if self._random.random() < self.config.connect_failure_rate:
+            self.failures["connect"] += 1
+            return False
+        self.connected = True
+        return True
+
+    async def disconnect(self) -> None:
+        """Simulate disconnecting."""
+        self.connected = False
+
+    async def probe_gatts(self, device: Any) -> tuple[str, str, str]:
+        """Return the GATT identity strings."""
+        await self._round_trip("probe_gatts")
+        return ("Husqvarna", "Automower\x00", "305")
+
+    async def get_model(self) -> str:
+        """Return the mower model."""
+        await self._round_trip("get_model")
+        return "305"
+
+    async def battery_level(self) -> int:
+        """Return the battery level."""
+        await self._round_trip("battery_level")
+        return self.battery
+
+    async def mower_activity(self) -> int:
+        """Return the mower activity."""
+        await self._round_trip("mower_activity")
+        return self.activity
+
+    async def mower_state(self) -> int:
+        """Return the mower state."""
+        await self._round_trip("mower_state")
+        return self.state
+
+    async def mower_next_start_time(self) -> int | None:
+        """Return the next scheduled start."""
+        await self._round_trip("mower_next_start_time")
+        return None
+
+    async def mower_resume(self) -> None:
+        """Simulate resuming."""
+        await self._round_trip("mower_resume")
+        self.state, self.activity = 6, 2
+
+    async def mower_override(self) -> None:
+        """Simulate an override mowing session."""
+        await self._round_trip("mower_override")
+        self.state, self.activity = 6, 3
+
+    async def mower_park(self) -> None:
+        """Simulate parking."""
+        await self._round_trip("mower_park")
+        self.state, self.activity = 6, 4
+
+    async def mower_pause(self) -> None:
+        """Simulate pausing."""
+        await self._round_trip("mower_pause")
+        self.state = 5
+
+    async def command(self, command_name: str, **kwargs: Any) -> Any:
+        """Return the canned response to a protocol command."""
+        await self._round_trip(command_name)
+        response = self._response(command_name)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def _response(self, command_name: str) -> Any:
+        """Return the response, or the exception, to a protocol command."""
+        match command_name:
+            case "GetBatteryLevel":
+                return self.battery
+            case "GetState":
+                return self.state
+            case "GetActivity":
+                return self.activity
+            case "GetNextStartTime":
+                return 0
+        return self.responses.get(command_name)
+
+    async def _write_data(self, data: bytes | bytearray) -> None:
+        """Take a request frame and answer it on the queue later."""
+        if not self.connected:
+            raise BleakError("Not connected")
+        name = self._commands[(int.from_bytes(data[12:14], "little"), data[14])]
+        task = asyncio.get_running_loop().create_task(self._async_answer(name))
+        self._answers.add(task)
+        task.add_done_callback(self._answers.discard)
+
+    async def _async_answer(self, name: str) -> None:
+        """Send the response frame to a request, unless it gets lost."""
+        try:
+            await self._round_trip(name)
+        except (BleakError, TimeoutError):
+            return
+        response = self._response(name)
+        if isinstance(response, Exception):
+            # Answer with a frame that fails to parse, like the library's
+            # known data length mismatch
+            frame = self._response_frame(name, None, corrupt=True)
+        else:
+            frame = self._response_frame(name, response)
+        for start in range(0, len(frame), MTU_SIZE):
+            self.queue.put_nowait(bytes(frame[start : start + MTU_SIZE]))
+
+    def _response_frame(
+        self, name: str, value: Any, corrupt: bool = False
+    ) -> bytearray:
+        """Encode a response the way the mower sends it."""
+        spec = self.protocol[name]
+        types = spec.get("responseType", "no_response")
+        if not isinstance(types, dict):
+            types, value = {"response": types}, {"response": value}
+        value = value or {}
+
+        data = bytearray()
+        for key, data_type in types.items():
+            if data_type == "ascii":
+                data += str(value.get(key) or "").encode("ascii")
+            elif data_type in TYPE_SIZES:
+                data += int(value.get(key) or 0).to_bytes(
+                    TYPE_SIZES[data_type], "little"
+                )
+        if corrupt:
+            data.append(0)
+
+        major = spec["major"].to_bytes(2, "little")
+        frame = bytearray(
+            [0x02, 0xFD, 0x00, 0x00, *self.channel_id.to_bytes(4, "little"), 0x01]
+        )
+        # CRC, response packet type, module, command, result OK, data length
+        frame += bytes([0x00, 0x01, 0xAF, *major, spec["minor"], 0x00, 0x00])
+        frame += len(data).to_bytes(2, "little") + data
+        frame[2] = len(frame) - 2
+        frame[9] = crc(frame, 1, 8)
+        frame.append(crc(frame, 1, len(frame) - 1))
+        frame.append(0x03)
+        return frame
+
+    async def _round_trip(self, name: str) -> None:
+        """Spend the time of one request/response and inject failures."""
+        if not self.connected:
+            raise BleakError("Not connected")
+
+        self.round_trips[name] += 1
+        config = self.config
+        roll = self._random.random()
+        if roll < config.timeout_rate:
+            self.failures[f"{name}:timeout"] += 1
+            await asyncio.sleep(config.timeout)
+            raise TimeoutError(f"{name} timed out")
+        roll -= config.timeout_rate
+        if roll < config.error_rate:
+            self.failures[f"{name}:error"] += 1
+            raise BleakError(f"{name} failed")
+        roll -= config.error_rate
+        if roll < config.dropout_rate:
+            self.failures[f"{name}:dropout"] += 1
+            self.connected = False
+            raise BleakError("Disconnected")
+
+        await asyncio.sleep(config.command_latency.get(name, config.latency))
+        async with self._busy:
+            await asyncio.sleep(config.processing)
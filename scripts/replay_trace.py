@@ -0,0 +1,383 @@
+"""Replay a recorded mower trace through the integration without a mower.
+
+Reads a trace written with the "record trace" option, answers every call
+the integration makes with the recorded response or exception, and repeats
+the polls, events and user actions in the recorded order on a clock that
+follows the trace. The lawn mower and sensor entities are attached, so a
+field issue caught in a trace becomes a repeatable run, and the calls and
+recorded BLE time each poll costs can be compared before and after a change.
+
+Run from the repository root with Home Assistant and the integration's
+requirements installed:
+
+    python scripts/replay_trace.py husqvarna_automower_ble_traces/aabbccddeeff-20240601-120000.jsonl.gz
+    python scripts/replay_trace.py TRACE --json report.json --strict
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timedelta
+import json
+import logging
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from bleak import BleakError
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.exceptions import HomeAssistantError  # noqa: E402
+
+from custom_components.husqvarna_automower_ble.command_queue import (  # noqa: E402
+    MowerAction,
+)
+from custom_components.husqvarna_automower_ble.coordinator import (  # noqa: E402
+    EVENT_REFRESH_COOLDOWN,
+    HusqvarnaCoordinator,
+)
+from custom_components.husqvarna_automower_ble.lawn_mower import (  # noqa: E402
+    FEATURES,
+    AutomowerLawnMower,
+)
+from custom_components.husqvarna_automower_ble.sensor import (  # noqa: E402
+    MOWER_SENSORS,
+    AutomowerSensorEntity,
+)
+from custom_components.husqvarna_automower_ble.session import (  # noqa: E402
+    MowerSession,
+)
+from custom_components.husqvarna_automower_ble.trace import (  # noqa: E402
+    TRACED_METHODS,
+    read_trace,
+)
+
+PACKAGE = "custom_components.husqvarna_automower_ble"
+
+# Exceptions raised again from their recorded names, anything else the
+# integration would not expect becomes a BleakError
+ERRORS: dict[str, type[Exception]] = {
+    "BleakError": BleakError,
+    "TimeoutError": TimeoutError,
+    "CancelledError": TimeoutError,
+    "ValueError": ValueError,
+}
+
+
+def _call_key(call: str, params: dict[str, Any]) -> tuple[str, str]:
+    """Return what a recorded call is matched on."""
+    return call, json.dumps(params, sort_keys=True)
+
+
+class TraceClock:
+    """Clock of the replay, set to the trace time of each mark."""
+
+    def __init__(self) -> None:
+        """Start the clock at the current time."""
+        self.start = datetime.now()
+        self.offset = 0.0
+
+    def now(self) -> datetime:
+        """Return the current trace time."""
+        return self.start + timedelta(seconds=self.offset)
+
+    def monotonic(self) -> float:
+        """Return the seconds since the trace started."""
+        return self.offset
+
+
+class ReplayMower:
+    """Stand-in for the Mower answering from a trace.
+
+    Calls are matched on their name and parameters and served in recorded
+    order. A call made more often than recorded gets the last recorded
+    outcome again, a call never recorded fails with BleakError.
+    """
+
+    def __init__(self, entries: list[dict[str, Any]]) -> None:
+        """Index the recorded calls."""
+        self._outcomes: dict[tuple[str, str], deque[dict[str, Any]]] = defaultdict(
+            deque
+        )
+        for entry in entries:
+            if "call" in entry:
+                self._outcomes[_call_key(entry["call"], entry.get("params", {}))].append(
+                    entry
+                )
+        self._last: dict[tuple[str, str], dict[str, Any]] = {}
+        self.connected = False
+        self.calls: Counter[str] = Counter()
+        self.reused: Counter[str] = Counter()
+        self.missing: Counter[str] = Counter()
+        self.recorded_ms = 0.0
+
+    def __getattr__(self, name: str) -> Any:
+        """Answer the traced Mower methods from the trace."""
+        if name not in TRACED_METHODS:
+            raise AttributeError(name)
+
+        async def replay() -> Any:
+            return self._replay(name, {})
+
+        return replay
+
+    def reset_counters(self) -> None:
+        """Forget the calls made so far."""
+        self.calls.clear()
+        self.recorded_ms = 0.0
+
+    @property
+    def unused(self) -> Counter[str]:
+        """Return the recorded calls that were never replayed."""
+        return Counter(
+            {key[0]: len(outcomes) for key, outcomes in self._outcomes.items() if outcomes}
+        )
+
+    def is_connected(self) -> bool:
+        """Return if the replayed link is up."""
+        return self.connected
+
+    async def connect(self, device: Any) -> bool:
+        """Connect if the trace did, or if it holds no connects at all."""
+        try:
+            self.connected = bool(self._replay("connect", {}, default=True))
+        except BleakError:
+            self.connected = False
+            raise
+        return self.connected
+
+    async def disconnect(self) -> None:
+        """Disconnect."""
+        self.connected = False
+
+    async def command(self, command_name: str, **kwargs: Any) -> Any:
+        """Return the recorded response to a protocol command."""
+        return self._replay(command_name, kwargs)
+
+    def _replay(
+        self, call: str, params: dict[str, Any], default: Any = None
+    ) -> Any:
+        """Return or raise the next recorded outcome of a call."""
+        key = _call_key(call, params)
+        self.calls[call] += 1
+        if self._outcomes[key]:
+            entry = self._last[key] = self._outcomes[key].popleft()
+        elif key in self._last:
+            self.reused[call] += 1
+            entry = self._last[key]
+        elif default is not None:
+            return default
+        else:
+            self.missing[call] += 1
+            raise BleakError(f"{call} {params} is not in the trace")
+
+        self.recorded_ms += entry["ms"]
+        if "error" in entry:
+            raise ERRORS.get(entry["error"], BleakError)(entry.get("message", ""))
+        return entry["result"]
+
+
+def recorded_polls(entries: list[dict[str, Any]]) -> list[tuple[int, float]]:
+    """Return the calls and recorded milliseconds of each recorded poll.
+
+    Only calls between a poll mark and the next mark count, which is the
+    poll_done mark in traces that have it.
+    """
+    polls: list[tuple[int, float]] = []
+    in_poll = False
+    for entry in entries:
+        if "mark" in entry:
+            in_poll = entry["mark"] == "poll"
+            if in_poll:
+                polls.append((0, 0.0))
+        elif in_poll:
+            calls, ms = polls[-1]
+            polls[-1] = (calls + 1, ms + entry["ms"])
+    return polls
+
+
+def _summary(polls: list[tuple[int, float]]) -> dict[str, float]:
+    """Return the mean calls and milliseconds per poll."""
+    if not polls:
+        return {"polls": 0, "calls": 0.0, "ms": 0.0}
+    return {
+        "polls": len(polls),
+        "calls": round(statistics.mean(calls for calls, _ in polls), 2),
+        "ms": round(statistics.mean(ms for _, ms in polls), 1),
+    }
+
+
+async def async_replay(
+    hass: HomeAssistant, header: dict[str, Any], entries: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Replay a trace and return a report."""
+    clock = TraceClock()
+
+    class TraceDatetime(datetime):
+        """datetime whose now() follows the trace."""
+
+        @classmethod
+        def now(cls, tz: Any = None) -> datetime:
+            return clock.now()
+
+    mower = ReplayMower(entries)
+    address = header["address"]
+    session = MowerSession(hass, mower, address, keepalive_interval=None)
+
+    with (
+        patch(f"{PACKAGE}.coordinator.datetime", TraceDatetime),
+        patch(f"{PACKAGE}.coordinator.CONFIRM_DELAY", timedelta(0)),
+        patch(f"{PACKAGE}.response_cache.time", SimpleNamespace(monotonic=clock.monotonic)),
+    ):
+        coordinator = HusqvarnaCoordinator(
+            hass,
+            session,
+            address,
+            header.get("model") or "unknown",
+            1,  # channel ID, not recorded and not needed without a mower
+            header.get("serial") or "unknown",
+            header.get("options"),
+        )
+        coordinator.presence.in_range = True
+
+        entities = [
+            AutomowerSensorEntity(coordinator, description, "automower_replay")
+            for description in MOWER_SENSORS
+        ]
+        lawn_mower = AutomowerLawnMower(
+            coordinator, "automower_replay", header.get("model"), FEATURES
+        )
+        entities.append(lawn_mower)
+        writes = 0
+
+        def count_write() -> None:
+            nonlocal writes
+            writes += 1
+
+        for entity in entities:
+            entity.hass = hass
+            entity.async_write_ha_state = count_write
+            coordinator.async_add_listener(entity._handle_coordinator_update)  # noqa: SLF001
+
+        replayed: list[tuple[int, float]] = []
+        marks: Counter[str] = Counter()
+        failed_polls = 0
+        failed_actions = 0
+        last_event_refresh: float | None = None
+        for entry in entries:
+            if "mark" not in entry:
+                continue
+            clock.offset = entry["at"]
+            marks[entry["mark"]] += 1
+            match entry["mark"]:
+                case "poll":
+                    mower.reset_counters()
+                    await coordinator.async_refresh()
+                    failed_polls += not coordinator.last_update_success
+                    replayed.append((mower.calls.total(), mower.recorded_ms))
+                case "event":
+                    # The debouncer reads once per cooldown during a burst
+                    if (
+                        last_event_refresh is None
+                        or clock.offset - last_event_refresh >= EVENT_REFRESH_COOLDOWN
+                    ):
+                        last_event_refresh = clock.offset
+                        await coordinator._async_refresh_on_event()  # noqa: SLF001
+                case "action":
+                    try:
+                        await coordinator.command_queue.async_submit(
+                            MowerAction(entry["action"]), entry.get("override", False)
+                        )
+                    except HomeAssistantError:
+                        failed_actions += 1
+
+        await coordinator.async_shutdown()
+
+    return {
+        "trace": {"address": address, "model": header.get("model"), "marks": dict(marks)},
+        "recorded": _summary(recorded_polls(entries)),
+        "replayed": _summary(replayed),
+        "failed_polls": failed_polls,
+        "failed_actions": failed_actions,
+        "state_writes": writes,
+        "missing_calls": dict(mower.missing),
+        "reused_calls": dict(mower.reused),
+        "unused_calls": dict(mower.unused),
+        "activity": str(lawn_mower.activity),
+        "data": coordinator.data.as_dict() if coordinator.data else None,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    """Print a report for people."""
+    trace = report["trace"]
+    print(f"== {trace['address']} ({trace['model']}) ==")
+    print(f"marks: {trace['marks']}")
+    print(f"{'per poll':<10} {'polls':>6} {'calls':>7} {'ble ms':>9}")
+    for name in ("recorded", "replayed"):
+        summary = report[name]
+        print(
+            f"{name:<10} {summary['polls']:>6} {summary['calls']:>7.2f} {summary['ms']:>9.1f}"
+        )
+    print(
+        f"failed polls: {report['failed_polls']}, failed actions: "
+        f"{report['failed_actions']}, state writes: {report['state_writes']}"
+    )
+    for name in ("missing_calls", "reused_calls", "unused_calls"):
+        if report[name]:
+            print(f"{name.replace('_', ' ')}: {report[name]}")
+    print(f"final activity: {report['activity']}")
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    """Replay the trace and report on it."""
+    header, entries = read_trace(args.trace)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        with (
+            patch(
+                "homeassistant.components.bluetooth.async_ble_device_from_address",
+                return_value=header["address"],
+            ),
+            patch(
+                f"{PACKAGE}.session.close_stale_connections_by_address",
+                AsyncMock(),
+            ),
+        ):
+            report = await async_replay(hass, header, entries)
+        await hass.async_stop(force=True)
+
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, default=str) + "\n")
+    return 1 if args.strict and report["missing_calls"] else 0
+
+
+def main() -> None:
+    """Parse arguments and run the replay."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="trace file written by the integration")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="exit with 1 when the integration made calls the trace doesn't hold",
+    )
+    parser.add_argument("--debug", action="store_true", help="show integration debug logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.WARNING)
+    sys.exit(asyncio.run(async_main(args)))
+
+
+if __name__ == "__main__":
+    main()